@@ -0,0 +1,101 @@
+"""
+Optional FinBERT sentiment backend.
+
+Scores financial news with an ONNX export of ``ProsusAI/finbert`` (ideally int8
+dynamically quantized) in a single batched forward pass, returning
+S = P(positive) - P(negative) per text. Requires ``onnxruntime`` and
+``tokenizers``; SentimentAgent falls back to VADER when they or the model files
+are unavailable.
+
+Expected model directory layout:
+    finbert-int8.onnx  # optimum-cli export onnx --model ProsusAI/finbert <dir>, then
+                       # onnxruntime.quantization.quantize_dynamic(model.onnx, finbert-int8.onnx,
+                       #                                           weight_type=QuantType.QInt8)
+    tokenizer.json     # fast tokenizer saved by the export
+    config.json        # optional; id2label mapping (defaults to the ProsusAI order)
+"""
+from __future__ import annotations
+
+import json
+import os
+from typing import Any, Dict, Optional, Sequence
+
+import numpy as np
+
+from ..utils.logging_utils import get_logger
+
+try:
+    import onnxruntime as ort
+    from tokenizers import Tokenizer
+except ImportError:
+    # Fallback: FinBERT unavailable, callers use VADER
+    ort = None
+    Tokenizer = None
+
+
+# Output order of ProsusAI/finbert
+_DEFAULT_ID2LABEL = {"0": "positive", "1": "negative", "2": "neutral"}
+
+
+class FinBertScorer:
+    """Batched FinBERT inference over an ONNX Runtime session."""
+
+    MODEL_FILE = "finbert-int8.onnx"
+    TOKENIZER_FILE = "tokenizer.json"
+
+    def __init__(
+        self,
+        session: Any,
+        tokenizer: Any,
+        id2label: Dict[str, str],
+        max_length: int = 128,
+    ) -> None:
+        self._session = session
+        self._tokenizer = tokenizer
+        self._tokenizer.enable_truncation(max_length=max_length)
+        self._tokenizer.enable_padding()  # pad to the longest text in each batch
+        label_ids = {label.lower(): int(idx) for idx, label in id2label.items()}
+        self._pos_idx = label_ids["positive"]
+        self._neg_idx = label_ids["negative"]
+        self._input_names = {i.name for i in session.get_inputs()}
+
+    @classmethod
+    def load(cls, model_dir: str, max_length: int = 128) -> Optional["FinBertScorer"]:
+        """Load the model from ``model_dir``; returns None (with a warning) if unavailable."""
+        logger = get_logger(__name__)
+        if ort is None or Tokenizer is None:
+            logger.warning("FinBERT requested but onnxruntime/tokenizers are not installed")
+            return None
+        try:
+            session = ort.InferenceSession(
+                os.path.join(model_dir, cls.MODEL_FILE), providers=["CPUExecutionProvider"]
+            )
+            tokenizer = Tokenizer.from_file(os.path.join(model_dir, cls.TOKENIZER_FILE))
+            id2label = _DEFAULT_ID2LABEL
+            config_path = os.path.join(model_dir, "config.json")
+            if os.path.exists(config_path):
+                with open(config_path, "r", encoding="utf-8") as f:
+                    id2label = json.load(f).get("id2label") or id2label
+            scorer = cls(session, tokenizer, id2label, max_length=max_length)
+            logger.info("FinBERT loaded from %s", model_dir)
+            return scorer
+        except Exception as e:
+            logger.warning("Failed to load FinBERT from %s: %s", model_dir, e)
+            return None
+
+    def score(self, texts: Sequence[str]) -> np.ndarray:
+        """Return P(positive) - P(negative) per text, in [-1, 1], from one forward pass."""
+        encodings = self._tokenizer.encode_batch(list(texts))
+        feed = {
+            "input_ids": np.array([e.ids for e in encodings], dtype=np.int64),
+            "attention_mask": np.array([e.attention_mask for e in encodings], dtype=np.int64),
+            "token_type_ids": np.array([e.type_ids for e in encodings], dtype=np.int64),
+        }
+        feed = {name: arr for name, arr in feed.items() if name in self._input_names}
+        logits = np.asarray(self._session.run(None, feed)[0], dtype=np.float64)
+
+        # Softmax over classes
+        logits -= logits.max(axis=1, keepdims=True)
+        probs = np.exp(logits)
+        probs /= probs.sum(axis=1, keepdims=True)
+        return probs[:, self._pos_idx] - probs[:, self._neg_idx]
@@ -0,0 +1,304 @@
+"""
+Piecewise scoring functions for FundamentalAgent.
+
+Scalar scorers are JIT-compiled (see utils.jit) and map a NaN (missing) input
+to a NaN score; ``score_all`` runs all of them plus the signal/confidence aggregation in
+a single compiled call for the per-ticker path. The ``*_batch`` variants score
+arrays of many tickers at once with NumPy.
+"""
+from __future__ import annotations
+
+from typing import Any, Dict, Mapping, Tuple
+
+import numpy as np
+
+from ..utils.jit import njit
+
+# Fundamentals fields and the part labels they are reported under, in scoring order
+FIELDS: Tuple[str, ...] = (
+    "pe",
+    "pb",
+    "roe",
+    "debt_to_equity",
+    "fcf_yield",
+    "revenue_yoy",
+    "earnings_yoy",
+    "ebitda_margin",
+)
+PART_LABELS: Tuple[str, ...] = (
+    "P/E",
+    "P/B",
+    "ROE",
+    "D/E",
+    "FCF Yield",
+    "Revenue YoY",
+    "Earnings YoY",
+    "EBITDA Margin",
+)
+
+
+@njit(cache=True)
+def _score_pe(pe: float) -> float:
+    if pe <= 10:
+        return 1.0
+    if pe >= 40:
+        return -1.0
+    if pe <= 20:
+        return 1.0 - (pe - 10) / 10.0  # 10->1, 20->0
+    if pe <= 30:
+        return -0.25 * (pe - 20)  # 20->0, 30->-2.5 -> cap later
+    return -0.5 - 0.5 * (pe - 30) / 10.0  # 30->-0.5, 40->-1
+
+
+@njit(cache=True)
+def _score_pb(pb: float) -> float:
+    if pb <= 1.0:
+        return 0.6  # cheap but might be value trap
+    if pb >= 6.0:
+        return -1.0
+    if pb <= 3.0:
+        return 0.6 - 0.6 * (pb - 1.0) / 2.0  # 1->0.6, 3->0
+    return -0.1 - 0.9 * (pb - 3.0) / 3.0  # 3->-0.1, 6->-1
+
+
+@njit(cache=True)
+def _score_roe(roe: float) -> float:
+    roe *= 100 if roe < 1 and roe > -1 else 1  # handle if in fraction
+    if roe <= 0:
+        return -1.0
+    if roe >= 20:
+        return 1.0
+    return -1.0 + (roe / 20.0) * 2.0  # 0->-1, 20->+1
+
+
+@njit(cache=True)
+def _score_de(de: float) -> float:
+    if de <= 0.2:
+        return 1.0
+    if de >= 2.0:
+        return -1.0
+    return 1.0 - (de - 0.2) / (2.0 - 0.2) * 2.0  # 0.2->1, 2->-1
+
+
+@njit(cache=True)
+def _score_fcf_yield(y: float) -> float:
+    y *= 100 if abs(y) < 1 else 1  # expect percent sometimes in fraction
+    if y <= -2:
+        return -1.0
+    if y >= 8:
+        return 1.0
+    return -1.0 + (y + 2) / 10.0 * 2.0  # -2->-1, 8->+1
+
+
+@njit(cache=True)
+def _score_growth(g: float, neg_full: float, pos_full: float) -> float:
+    g *= 100 if abs(g) < 1 else 1
+    if g <= neg_full:
+        return -1.0
+    if g >= pos_full:
+        return 1.0
+    return -1.0 + (g - neg_full) / (pos_full - neg_full) * 2.0
+
+
+@njit(cache=True)
+def _score_margin(m: float) -> float:
+    m *= 100 if abs(m) < 1 else 1
+    if m <= 0:
+        return -1.0
+    if m >= 30:
+        return 1.0
+    return -1.0 + (m / 30.0) * 2.0
+
+
+@njit(cache=True)
+def _extremes(parts: np.ndarray) -> np.ndarray:
+    """
+    Indices of the two weakest and two strongest parts without a full sort.
+
+    Equivalent to ``argsort(parts, kind="stable")[[0, 1, -2, -1]]``: ties among
+    the weakest resolve to the lower index, among the strongest to the higher.
+    """
+    w0, w1, b0, b1 = -1, -1, -1, -1
+    for i in range(parts.shape[0]):
+        v = parts[i]
+        if w0 < 0 or v < parts[w0]:
+            w1, w0 = w0, i
+        elif w1 < 0 or v < parts[w1]:
+            w1 = i
+        if b1 < 0 or v >= parts[b1]:
+            b0, b1 = b1, i
+        elif b0 < 0 or v >= parts[b0]:
+            b0 = i
+    out = np.empty(4, dtype=np.int64)
+    out[0], out[1], out[2], out[3] = w0, w1, b0, b1
+    return out
+
+
+@njit(cache=True)
+def score_all(
+    pe: float,
+    pb: float,
+    roe: float,
+    de: float,
+    fcf_yield: float,
+    revenue_yoy: float,
+    earnings_yoy: float,
+    ebitda_margin: float,
+) -> Tuple[float, float, float, np.ndarray, np.ndarray]:
+    """
+    Score one ticker's fundamentals (NaN = missing) in a single compiled call.
+
+    Returns:
+        (signal, confidence, coverage, parts, extremes) where ``parts`` holds
+        the clipped per-field scores in PART_LABELS order and ``extremes`` the
+        part indices of the two weakest then the two strongest (see _extremes).
+    """
+    # Fold +/-inf into NaN (x - x is 0 for finite x). NaN falls through every
+    # comparison into the scorers' final interpolation, so missing inputs come
+    # out NaN and are masked to 0 in one step instead of branching per field
+    raw = np.empty(8)
+    raw[0] = _score_pe(pe + (pe - pe))
+    raw[1] = _score_pb(pb + (pb - pb))
+    raw[2] = _score_roe(roe + (roe - roe))
+    raw[3] = _score_de(de + (de - de))
+    raw[4] = _score_fcf_yield(fcf_yield + (fcf_yield - fcf_yield))
+    raw[5] = _score_growth(revenue_yoy + (revenue_yoy - revenue_yoy), -20.0, 20.0)
+    raw[6] = _score_growth(earnings_yoy + (earnings_yoy - earnings_yoy), -30.0, 20.0)
+    raw[7] = _score_margin(ebitda_margin + (ebitda_margin - ebitda_margin))
+    parts = np.where(np.isnan(raw), 0.0, np.clip(raw, -1.0, 1.0))
+
+    # Every part yields a score (missing inputs score 0). Sum and sum of
+    # squares are accumulated in one pass; the sum keeps its sequential order
+    # so the signal is unchanged, and the variance is clamped at 0 against
+    # cancellation (parts are bounded in [-1, 1], so it stays well conditioned)
+    n = parts.shape[0]
+    total = 0.0
+    total_sq = 0.0
+    for i in range(n):
+        total += parts[i]
+        total_sq += parts[i] * parts[i]
+    signal = total / n
+    variance = max(0.0, total_sq / n - signal * signal)
+
+    # Confidence: coverage and consistency (lower dispersion => higher confidence)
+    coverage = 1.0
+    dispersion = min(1.0, variance)  # cap
+    confidence = max(0.0, min(1.0, 0.3 + 0.5 * coverage + 0.2 * (1 - dispersion)))
+
+    return signal, confidence, coverage, parts, _extremes(parts)
+
+
+def warmup() -> None:
+    """Compile the scalar scorers up front so the first analysis is not penalized."""
+    score_all(np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan, np.nan)
+
+
+# ------------------------
+# Vectorized scorers (many tickers at once)
+# ------------------------
+# Each mirrors the branch order of its scalar counterpart above; non-finite
+# inputs are zeroed and results clipped to [-1, 1] in score_batch.
+
+def _as_percent(x: np.ndarray) -> np.ndarray:
+    return np.where(np.abs(x) < 1, x * 100, x)
+
+
+def _score_pe_batch(pe: np.ndarray) -> np.ndarray:
+    return np.select(
+        [pe <= 10, pe >= 40, pe <= 20, pe <= 30],
+        [1.0, -1.0, 1.0 - (pe - 10) / 10.0, -0.25 * (pe - 20)],
+        default=-0.5 - 0.5 * (pe - 30) / 10.0,
+    )
+
+
+def _score_pb_batch(pb: np.ndarray) -> np.ndarray:
+    return np.select(
+        [pb <= 1.0, pb >= 6.0, pb <= 3.0],
+        [0.6, -1.0, 0.6 - 0.6 * (pb - 1.0) / 2.0],
+        default=-0.1 - 0.9 * (pb - 3.0) / 3.0,
+    )
+
+
+def _score_roe_batch(roe: np.ndarray) -> np.ndarray:
+    roe = np.where((roe < 1) & (roe > -1), roe * 100, roe)
+    return np.select([roe <= 0, roe >= 20], [-1.0, 1.0], default=-1.0 + (roe / 20.0) * 2.0)
+
+
+def _score_de_batch(de: np.ndarray) -> np.ndarray:
+    return np.select(
+        [de <= 0.2, de >= 2.0], [1.0, -1.0], default=1.0 - (de - 0.2) / (2.0 - 0.2) * 2.0
+    )
+
+
+def _score_fcf_yield_batch(y: np.ndarray) -> np.ndarray:
+    y = _as_percent(y)
+    return np.select([y <= -2, y >= 8], [-1.0, 1.0], default=-1.0 + (y + 2) / 10.0 * 2.0)
+
+
+def _score_growth_batch(g: np.ndarray, neg_full: float, pos_full: float) -> np.ndarray:
+    g = _as_percent(g)
+    return np.select(
+        [g <= neg_full, g >= pos_full],
+        [-1.0, 1.0],
+        default=-1.0 + (g - neg_full) / (pos_full - neg_full) * 2.0,
+    )
+
+
+def _score_margin_batch(m: np.ndarray) -> np.ndarray:
+    m = _as_percent(m)
+    return np.select([m <= 0, m >= 30], [-1.0, 1.0], default=-1.0 + (m / 30.0) * 2.0)
+
+
+# Part label -> (fundamentals field, vectorized scorer), in PART_LABELS order
+_BATCH_SCORERS = tuple(zip(PART_LABELS, FIELDS, (
+    _score_pe_batch,
+    _score_pb_batch,
+    _score_roe_batch,
+    _score_de_batch,
+    _score_fcf_yield_batch,
+    lambda g: _score_growth_batch(g, neg_full=-20, pos_full=20),
+    lambda g: _score_growth_batch(g, neg_full=-30, pos_full=20),
+    _score_margin_batch,
+)))
+
+
+def score_batch(arrays: Mapping[str, Any]) -> Dict[str, np.ndarray]:
+    """
+    Score fundamentals for many tickers at once.
+
+    Args:
+        arrays: Mapping of fundamentals field (``pe``, ``pb``, ``roe``, ...) to a 1-D
+                array-like with one entry per ticker. Missing fields and missing
+                values (None/NaN) score 0, as in the scalar path.
+
+    Returns:
+        Dictionary mapping part label (``"P/E"``, ``"ROE"``, ...) to clipped scores.
+    """
+    columns = {f: np.asarray(arrays[f], dtype=np.float64) for _, f, _ in _BATCH_SCORERS if f in arrays}
+    n = len(next(iter(columns.values()))) if columns else 0
+    scores: Dict[str, np.ndarray] = {}
+    with np.errstate(invalid="ignore"):
+        for label, field, scorer in _BATCH_SCORERS:
+            x = columns.get(field)
+            if x is None:
+                x = np.full(n, np.nan)
+            raw = np.where(np.isfinite(x), scorer(x), 0.0)
+            scores[label] = np.clip(raw, -1.0, 1.0)
+    return scores
+
+
+def extremes_batch(matrix: np.ndarray) -> np.ndarray:
+    """Row-wise ``_extremes`` over an (n_tickers, n_parts) score matrix."""
+    rows = np.arange(len(matrix))
+    work = matrix.astype(np.float64, copy=True)
+    w0 = np.argmin(work, axis=1)  # first occurrence => lowest index on ties
+    work[rows, w0] = np.inf
+    w1 = np.argmin(work, axis=1)
+
+    # Scan reversed columns so argmax's first occurrence is the highest index
+    last = matrix.shape[1] - 1
+    work = matrix[:, ::-1].astype(np.float64, copy=True)
+    b1 = np.argmax(work, axis=1)
+    work[rows, b1] = -np.inf
+    b0 = np.argmax(work, axis=1)
+    return np.column_stack([w0, w1, last - b0, last - b1])
@@ -1,19 +1,63 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import threading
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
-from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
 
 from .base_agent import BaseAgent
+from .finbert import FinBertScorer
+from .vader import FastVaderAnalyzer
+from ..utils.jit import njit
 from ..utils.logging_utils import get_logger
 from ..utils.normalization import clip_signal
 
 
+# One VADER analyzer (lexicon load ~100ms) shared by every SentimentAgent;
+# scoring does not mutate it, so concurrent use is safe
+_SHARED_ANALYZER: Optional[FastVaderAnalyzer] = None
+_SHARED_ANALYZER_LOCK = threading.Lock()
+
+
+def _get_shared_analyzer() -> FastVaderAnalyzer:
+    """Return the process-wide analyzer, building it on first use."""
+    global _SHARED_ANALYZER
+    if _SHARED_ANALYZER is None:
+        with _SHARED_ANALYZER_LOCK:
+            if _SHARED_ANALYZER is None:
+                _SHARED_ANALYZER = FastVaderAnalyzer()
+    return _SHARED_ANALYZER
+
+
+@njit(cache=True)
+def _polarity_counts(scores: np.ndarray) -> Tuple[int, int]:
+    """Return (pos_ct, neg_ct): scores at or beyond the +/-0.2 polarity cutoffs."""
+    pos_ct = 0
+    neg_ct = 0
+    for i in range(scores.shape[0]):
+        if scores[i] >= 0.2:
+            pos_ct += 1
+        elif scores[i] <= -0.2:
+            neg_ct += 1
+    return pos_ct, neg_ct
+
+
 class SentimentAgent(BaseAgent):
-    def __init__(self) -> None:
+    def __init__(self, finbert_model_dir: Optional[str] = None) -> None:
+        """
+        Args:
+            finbert_model_dir: Optional directory with an ONNX FinBERT export (see
+                               agents.finbert). When it loads, headlines are scored
+                               with FinBERT in one batch; otherwise VADER is used.
+        """
         self.logger = get_logger(__name__)
-        self.analyzer = SentimentIntensityAnalyzer()
+        self._finbert = FinBertScorer.load(finbert_model_dir) if finbert_model_dir else None
+        # VADER is only needed without FinBERT (or as its runtime fallback)
+        self.analyzer = _get_shared_analyzer() if self._finbert is None else None
+        # Headlines repeat across calls (cached news), so memoize per-text scores
+        self._compound = lru_cache(maxsize=1024)(self._score_text)
+        _polarity_counts(np.zeros(1))  # compile up front
 
     def analyze(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze with input validation and error handling."""
@@ -39,25 +83,30 @@ class SentimentAgent(BaseAgent):
             "rationale": reason,
         }
     
+    def _score_text(self, text: str) -> float:
+        """VADER compound score for a single text, already in [-1, 1]."""
+        if self.analyzer is None:
+            self.analyzer = _get_shared_analyzer()
+        return self.analyzer.compound(text)
+
+    def _score_texts(self, texts: List[str]) -> np.ndarray:
+        """Score all texts, batched through FinBERT when available."""
+        if self._finbert is not None:
+            try:
+                return self._finbert.score(texts)
+            except Exception as e:
+                self.logger.warning("FinBERT scoring failed, falling back to VADER: %s", e)
+        return np.fromiter((self._compound(t) for t in texts), dtype=np.float64, count=len(texts))
+
     def _compute_sentiment_signals(self, news: List[Dict[str, Any]]) -> Dict[str, Any]:
 
-        scores: List[float] = []
-        pos_ct = 0
-        neg_ct = 0
-        for item in news:
-            text = (item.get("headline") or "") + ". " + (item.get("summary") or "")
-            text = text.strip()
-            if not text:
-                continue
-            vs = self.analyzer.polarity_scores(text)
-            comp = float(vs.get("compound", 0.0))  # already in [-1,1]
-            scores.append(comp)
-            if comp >= 0.2:
-                pos_ct += 1
-            elif comp <= -0.2:
-                neg_ct += 1
-
-        if not scores:
+        texts = [
+            ((item.get("headline") or "") + ". " + (item.get("summary") or "")).strip()
+            for item in news
+        ]
+        texts = [t for t in texts if t]
+
+        if not texts:
             return {
                 "signal": 0.0,
                 "confidence": 0.1,
@@ -65,8 +114,10 @@ class SentimentAgent(BaseAgent):
                 "rationale": "Insufficient textual content for sentiment scoring.",
             }
 
-        avg = float(np.mean(scores))
-        std = float(np.std(scores))
+        scores = self._score_texts(texts)
+        avg = float(scores.mean())
+        std = float(scores.std())
+        pos_ct, neg_ct = _polarity_counts(scores)
         n = len(scores)
 
         # Confidence: more items and tighter agreement => higher confidence
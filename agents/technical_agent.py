@@ -1,22 +1,351 @@
 from __future__ import annotations
 
-from typing import Any, Dict, Optional
-from io import StringIO
+import math
+from typing import Any, Dict, Optional, Tuple
 
 import numpy as np
-import pandas as pd
-from ta.momentum import RSIIndicator
-from ta.trend import MACD, SMAIndicator
-from ta.volatility import BollingerBands
 
 from .base_agent import BaseAgent
+from ..utils.jit import njit
 from ..utils.logging_utils import get_logger
 from ..utils.normalization import clip_signal
+from ..utils.serialization import get_or_parse_prices
+
+
+@njit(cache=True)
+def _tech_kernel(close: np.ndarray, volume: np.ndarray) -> Tuple[float, ...]:
+    """
+    Compute the last value of every indicator used by TechnicalAgent in one pass.
+
+    Mirrors the ``ta`` definitions (RSI with Wilder smoothing, MACD 12/26/9 EMAs
+    with ``adjust=False``, 20-period Bollinger Bands with ddof=0 and simple moving
+    averages), including how they treat NaN closes, but only keeps the state
+    needed for the final bar. Inputs stay
+    float64: the EMA/RSI recursions are latency-bound rather than memory-bound,
+    and float32 inputs measured slower (per-element conversions) for no gain.
+
+    Returns:
+        (rsi, macd_z, bb_high, bb_low, sma20, sma50, sma200, vol_avg20), where
+        macd_z is the last MACD histogram value z-scored against its trailing 50
+        values. Values that lack enough history are NaN.
+    """
+    n = close.shape[0]
+    nan = np.nan
+
+    # RSI(14): Wilder smoothing of gains/losses, seeded with a zero first diff
+    rsi_alpha = 1.0 / 14.0
+    avg_gain = 0.0
+    avg_loss = 0.0
+
+    # MACD(12, 26, 9): EMA recursions seeded with the first observed close. Like
+    # ewm(adjust=False), a NaN close carries the EMAs forward and decays their old
+    # weight, and the next close is blended against that weight. MACD exists from
+    # the 26th observed close and the histogram from the 9th MACD value.
+    fast_alpha = 2.0 / 13.0
+    slow_alpha = 2.0 / 27.0
+    sign_alpha = 2.0 / 10.0
+    ema_fast = nan
+    ema_slow = nan
+    fast_wt = 1.0
+    slow_wt = 1.0
+    ema_sign = nan
+    macd_hist = nan
+    seen = 0
+    macd_count = 0
+    hist_count = 0
+
+    # Only the trailing 50 histogram values feed the z-score; they exist once
+    # the histogram spans the last 50 bars
+    hist_start = n - 50
+    hist_buf = np.empty(50)
+
+    for i in range(n):
+        c = close[i]
+        if i > 0:
+            # A NaN diff counts as no gain and no loss, as in ta's diff().where()
+            diff = c - close[i - 1]
+            gain = diff if diff > 0 else 0.0
+            loss = -diff if diff < 0 else 0.0
+            avg_gain = (1.0 - rsi_alpha) * avg_gain + rsi_alpha * gain
+            avg_loss = (1.0 - rsi_alpha) * avg_loss + rsi_alpha * loss
+
+        if c != c:
+            fast_wt *= 1.0 - fast_alpha
+            slow_wt *= 1.0 - slow_alpha
+        else:
+            seen += 1
+            if seen == 1:
+                ema_fast = c
+                ema_slow = c
+            elif fast_wt == 1.0:
+                ema_fast = (1.0 - fast_alpha) * ema_fast + fast_alpha * c
+                ema_slow = (1.0 - slow_alpha) * ema_slow + slow_alpha * c
+            else:
+                fast_wt *= 1.0 - fast_alpha
+                slow_wt *= 1.0 - slow_alpha
+                ema_fast = (fast_wt * ema_fast + fast_alpha * c) / (fast_wt + fast_alpha)
+                ema_slow = (slow_wt * ema_slow + slow_alpha * c) / (slow_wt + slow_alpha)
+            fast_wt = 1.0
+            slow_wt = 1.0
+        if seen >= 26:
+            macd = ema_fast - ema_slow
+            macd_count += 1
+            if macd_count == 1:
+                ema_sign = macd
+            else:
+                ema_sign = (1.0 - sign_alpha) * ema_sign + sign_alpha * macd
+            if macd_count >= 9:
+                macd_hist = macd - ema_sign
+                hist_count += 1
+                if i >= hist_start:
+                    hist_buf[i - hist_start] = macd_hist
+
+    if n >= 14:
+        rsi = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    else:
+        rsi = nan
+
+    if hist_count >= 50:
+        macd_z = (macd_hist - hist_buf.mean()) / (hist_buf.std() + 1e-9)
+    else:
+        macd_z = nan
+
+    if n >= 20:
+        window20 = close[n - 20:]
+        sma20 = window20.mean()
+        std20 = window20.std()
+        bb_high = sma20 + 2.0 * std20
+        bb_low = sma20 - 2.0 * std20
+        vol_avg20 = volume[n - 20:].mean()
+    else:
+        sma20 = nan
+        bb_high = nan
+        bb_low = nan
+        vol_avg20 = nan
+    sma50 = close[n - 50:].mean() if n >= 50 else sma20
+    sma200 = close[n - 200:].mean() if n >= 200 else sma50
+
+    return (rsi, macd_z, bb_high, bb_low, sma20, sma50, sma200, vol_avg20)
+
+
+def _sign(x: float) -> int:
+    """Sign of a scalar as -1/0/+1 without a NumPy ufunc dispatch."""
+    return (x > 0) - (x < 0)
+
+
+# Streaming state layout for analyze_tick (scalars and counters of the _tech_kernel recursions)
+(
+    _S_COUNT, _S_PREV, _S_GAIN, _S_LOSS, _S_FAST, _S_SLOW, _S_SIGN, _S_HIST,
+    _S_FAST_WT, _S_SLOW_WT, _S_SEEN, _S_MACD_COUNT, _S_HIST_COUNT,
+) = range(13)
+_STREAM_STATE_SIZE = 13
+
+
+@njit(cache=True)
+def _ring_push(ring: np.ndarray, i: int, value: float) -> None:
+    """Store the i-th value in a double-written ring (capacity ``len(ring) // 2``)."""
+    cap = ring.shape[0] // 2
+    j = i % cap
+    ring[j] = value
+    ring[j + cap] = value
+
+
+@njit(cache=True)
+def _ring_tail(ring: np.ndarray, count: int, m: int) -> np.ndarray:
+    """Contiguous chronological view of the last ``m`` of ``count`` pushed values."""
+    start = (count - m) % (ring.shape[0] // 2)
+    return ring[start:start + m]
+
+
+@njit(cache=True)
+def _stream_update(
+    state: np.ndarray,
+    close_ring: np.ndarray,
+    volume_ring: np.ndarray,
+    hist_ring: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+) -> None:
+    """Advance the streaming state by the bars in ``close``/``volume`` (same recursions as _tech_kernel)."""
+    rsi_alpha = 1.0 / 14.0
+    fast_alpha = 2.0 / 13.0
+    slow_alpha = 2.0 / 27.0
+    sign_alpha = 2.0 / 10.0
+    for k in range(close.shape[0]):
+        i = int(state[_S_COUNT])
+        c = close[k]
+        if i == 0:
+            state[_S_FAST] = np.nan
+            state[_S_SLOW] = np.nan
+            state[_S_SIGN] = np.nan
+            state[_S_HIST] = np.nan
+            state[_S_FAST_WT] = 1.0
+            state[_S_SLOW_WT] = 1.0
+        else:
+            diff = c - state[_S_PREV]
+            gain = diff if diff > 0 else 0.0
+            loss = -diff if diff < 0 else 0.0
+            state[_S_GAIN] = (1.0 - rsi_alpha) * state[_S_GAIN] + rsi_alpha * gain
+            state[_S_LOSS] = (1.0 - rsi_alpha) * state[_S_LOSS] + rsi_alpha * loss
+
+        if c != c:
+            state[_S_FAST_WT] *= 1.0 - fast_alpha
+            state[_S_SLOW_WT] *= 1.0 - slow_alpha
+        else:
+            state[_S_SEEN] += 1.0
+            fast_wt = state[_S_FAST_WT]
+            slow_wt = state[_S_SLOW_WT]
+            if state[_S_SEEN] == 1.0:
+                state[_S_FAST] = c
+                state[_S_SLOW] = c
+            elif fast_wt == 1.0:
+                state[_S_FAST] = (1.0 - fast_alpha) * state[_S_FAST] + fast_alpha * c
+                state[_S_SLOW] = (1.0 - slow_alpha) * state[_S_SLOW] + slow_alpha * c
+            else:
+                fast_wt *= 1.0 - fast_alpha
+                slow_wt *= 1.0 - slow_alpha
+                state[_S_FAST] = (fast_wt * state[_S_FAST] + fast_alpha * c) / (fast_wt + fast_alpha)
+                state[_S_SLOW] = (slow_wt * state[_S_SLOW] + slow_alpha * c) / (slow_wt + slow_alpha)
+            state[_S_FAST_WT] = 1.0
+            state[_S_SLOW_WT] = 1.0
+        if state[_S_SEEN] >= 26.0:
+            macd = state[_S_FAST] - state[_S_SLOW]
+            state[_S_MACD_COUNT] += 1.0
+            if state[_S_MACD_COUNT] == 1.0:
+                state[_S_SIGN] = macd
+            else:
+                state[_S_SIGN] = (1.0 - sign_alpha) * state[_S_SIGN] + sign_alpha * macd
+            if state[_S_MACD_COUNT] >= 9.0:
+                state[_S_HIST] = macd - state[_S_SIGN]
+                _ring_push(hist_ring, int(state[_S_HIST_COUNT]), state[_S_HIST])
+                state[_S_HIST_COUNT] += 1.0
+        _ring_push(close_ring, i, c)
+        _ring_push(volume_ring, i, volume[k])
+        state[_S_PREV] = c
+        state[_S_COUNT] = i + 1
+
+
+@njit(cache=True)
+def _stream_indicators(
+    state: np.ndarray,
+    close_ring: np.ndarray,
+    volume_ring: np.ndarray,
+    hist_ring: np.ndarray,
+) -> Tuple[float, ...]:
+    """Indicators for the latest streamed bar, in _tech_kernel's return layout."""
+    n = int(state[_S_COUNT])
+    nan = np.nan
+
+    if n >= 14:
+        avg_gain = state[_S_GAIN]
+        avg_loss = state[_S_LOSS]
+        rsi = 100.0 if avg_loss == 0 else 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    else:
+        rsi = nan
+
+    hist_count = int(state[_S_HIST_COUNT])
+    if hist_count >= 50:
+        hist_tail = _ring_tail(hist_ring, hist_count, 50)
+        macd_z = (state[_S_HIST] - hist_tail.mean()) / (hist_tail.std() + 1e-9)
+    else:
+        macd_z = nan
+
+    if n >= 20:
+        window20 = _ring_tail(close_ring, n, 20)
+        sma20 = window20.mean()
+        std20 = window20.std()
+        bb_high = sma20 + 2.0 * std20
+        bb_low = sma20 - 2.0 * std20
+        vol_avg20 = _ring_tail(volume_ring, n, 20).mean()
+    else:
+        sma20 = nan
+        bb_high = nan
+        bb_low = nan
+        vol_avg20 = nan
+    sma50 = _ring_tail(close_ring, n, 50).mean() if n >= 50 else sma20
+    sma200 = _ring_tail(close_ring, n, 200).mean() if n >= 200 else sma50
+
+    return (rsi, macd_z, bb_high, bb_low, sma20, sma50, sma200, vol_avg20)
+
+
+def _warmup_kernel() -> None:
+    """Compile the indicator kernel up front so the first analyze() call is not penalized."""
+    # Match analyze()'s inputs: contiguous read-only column views of the shared
+    # parsed price matrix (a different layout/mutability compiles a new signature)
+    prices = np.asfortranarray(np.column_stack([np.linspace(100.0, 110.0, 60), np.ones(60)]))
+    prices.setflags(write=False)
+    _tech_kernel(prices[:, 0], prices[:, 1])
+
+    state = np.zeros(_STREAM_STATE_SIZE)
+    rings = (np.empty(400), np.empty(40), np.empty(100))
+    _stream_update(state, *rings, prices[:, 0], prices[:, 1])
+    _stream_indicators(state, *rings)
 
 
 class TechnicalAgent(BaseAgent):
     def __init__(self) -> None:
         self.logger = get_logger(__name__)
+        _warmup_kernel()
+        # Streaming state for analyze_tick; rings are double-written so every
+        # window is a contiguous slice (close: 200 bars, volume: 20, MACD hist: 50)
+        self._stream_state = np.zeros(_STREAM_STATE_SIZE)
+        self._close_ring = np.empty(2 * 200)
+        self._volume_ring = np.empty(2 * 20)
+        self._hist_ring = np.empty(2 * 50)
+
+    def reset_stream(self, market_data: Optional[Dict[str, Any]] = None) -> None:
+        """
+        Clear the analyze_tick state, optionally seeding it with a snapshot's price history.
+
+        Args:
+            market_data: Snapshot as passed to ``analyze``; its Close/Volume history
+                         is replayed so the next ``analyze_tick`` continues from it
+        """
+        self._stream_state[:] = 0.0
+        if not market_data:
+            return
+        prices_payload = (market_data.get("price_data") or {}).get("prices")
+        if not prices_payload:
+            return
+        prices, columns = get_or_parse_prices(prices_payload)
+        if prices.size:
+            self._stream(prices[:, columns.index("Close")], prices[:, columns.index("Volume")])
+
+    def analyze_tick(self, bar: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Append one bar to the streaming state and score it in O(1).
+
+        Gives the same result as ``analyze`` on the full history streamed so far
+        (see ``reset_stream``), without re-running the indicators over it; meant
+        for bar-by-bar backtests and live feeds.
+
+        Args:
+            bar: Mapping with at least ``Close`` and ``Volume``
+        """
+        try:
+            close = np.array([float(bar["Close"])])
+            volume = np.array([float(bar["Volume"])])
+        except (KeyError, TypeError, ValueError) as e:
+            return self._neutral_response(f"Invalid bar: {e}")
+
+        n = self._stream(close, volume)
+        if n < 20:
+            return self._neutral_response(f"Insufficient data points ({n} < 20)")
+        try:
+            indicators = _stream_indicators(
+                self._stream_state, self._close_ring, self._volume_ring, self._hist_ring
+            )
+            return self._score_indicators(indicators, close[0], volume[0])
+        except Exception as e:
+            self.logger.error("Technical analysis failed: %s", e)
+            return self._neutral_response(f"Analysis error: {str(e)}")
+
+    def _stream(self, close: np.ndarray, volume: np.ndarray) -> int:
+        """Feed bars into the streaming state; returns the number of bars seen."""
+        _stream_update(
+            self._stream_state, self._close_ring, self._volume_ring, self._hist_ring, close, volume
+        )
+        return int(self._stream_state[_S_COUNT])
 
     def analyze(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze with robust error handling and validation."""
@@ -30,19 +359,21 @@ class TechnicalAgent(BaseAgent):
             return self._neutral_response("No price data available")
 
         try:
-            df = pd.read_json(StringIO(prices_payload["data"]), orient="split")
+            prices, columns = get_or_parse_prices(prices_payload)
         except Exception as e:
             self.logger.error("Failed to parse price data: %s", e)
             return self._neutral_response("Failed to parse price data payload")
 
-        if df is None or df.empty:
+        if prices.size == 0:
             return self._neutral_response("Empty price series")
         
-        if len(df) < 20:
-            return self._neutral_response(f"Insufficient data points ({len(df)} < 20)")
+        if len(prices) < 20:
+            return self._neutral_response(f"Insufficient data points ({len(prices)} < 20)")
         
         try:
-            return self._compute_technical_signals(df)
+            close = prices[:, columns.index("Close")]
+            volume = prices[:, columns.index("Volume")]
+            return self._compute_technical_signals(close, volume)
         except Exception as e:
             self.logger.error("Technical analysis failed: %s", e)
             return self._neutral_response(f"Analysis error: {str(e)}")
@@ -56,61 +387,44 @@ class TechnicalAgent(BaseAgent):
             "rationale": reason,
         }
     
-    def _compute_technical_signals(self, df: pd.DataFrame) -> Dict[str, Any]:
+    def _compute_technical_signals(self, close: np.ndarray, volume: np.ndarray) -> Dict[str, Any]:
 
         """Compute technical indicators and aggregate signals."""
-        df = df.copy()
-        close = df["Close"].astype(float)
-        high = df["High"].astype(float)
-        low = df["Low"].astype(float)
-        volume = df["Volume"].astype(float)
+        # All indicators come from a single fused pass over the price arrays
+        return self._score_indicators(_tech_kernel(close, volume), close[-1], volume[-1])
 
-        # Indicators with safety checks
-        try:
-            rsi = RSIIndicator(close, window=14).rsi().iloc[-1]
-            if not np.isfinite(rsi):
-                rsi = 50.0  # Neutral default
-        except Exception:
-            rsi = 50.0
-        
-        try:
-            macd_obj = MACD(close, window_slow=26, window_fast=12, window_sign=9)
-            macd_hist = macd_obj.macd_diff()
-            macd_hist_z = (macd_hist - macd_hist.rolling(50).mean()) / (macd_hist.rolling(50).std(ddof=0) + 1e-9)
-            macd_val = macd_hist_z.iloc[-1]
-            macd_score = float(np.tanh(macd_val / 2.0)) if np.isfinite(macd_val) else 0.0
-        except Exception:
-            macd_score = 0.0
+    def _score_indicators(
+        self, indicators: Tuple[float, ...], price: float, last_volume: float
+    ) -> Dict[str, Any]:
+        """Aggregate last-bar indicator values (``_tech_kernel`` layout) into a signal."""
+        # Python floats keep the comparisons below as plain bools (NumPy scalars
+        # come back from the kernel when numba is unavailable)
+        rsi, macd_val, bb_high, bb_low, sma20, sma50, sma200, vol_avg = map(float, indicators)
+        price = float(price)
 
-        try:
-            bb = BollingerBands(close, window=20, window_dev=2)
-            bb_high = bb.bollinger_hband().iloc[-1]
-            bb_low = bb.bollinger_lband().iloc[-1]
-            if np.isfinite(bb_high) and np.isfinite(bb_low) and (bb_high - bb_low) > 0:
-                pct_b = (close.iloc[-1] - bb_low) / (bb_high - bb_low)
-                bb_score = float(2 * pct_b - 1.0)  # map [0,1] -> [-1,1]
-            else:
-                bb_score = 0.0
-        except Exception:
+        if not math.isfinite(rsi):
+            rsi = 50.0  # Neutral default
+
+        macd_score = float(np.tanh(macd_val / 2.0)) if math.isfinite(macd_val) else 0.0
+
+        if math.isfinite(bb_high) and math.isfinite(bb_low) and (bb_high - bb_low) > 0:
+            pct_b = (price - bb_low) / (bb_high - bb_low)
+            bb_score = float(2 * pct_b - 1.0)  # map [0,1] -> [-1,1]
+        else:
             bb_score = 0.0
 
-        try:
-            sma20 = SMAIndicator(close, window=20).sma_indicator().iloc[-1]
-            sma50 = SMAIndicator(close, window=50).sma_indicator().iloc[-1] if len(close) >= 50 else sma20
-            sma200 = SMAIndicator(close, window=200).sma_indicator().iloc[-1] if len(close) >= 200 else sma50
-            price = close.iloc[-1]
-
-            # MA structure score: stacking and price vs. MAs
-            if all(np.isfinite([sma20, sma50, sma200, price])):
-                stack_score = (
-                    np.sign((sma20 - sma50)) + np.sign((sma50 - sma200)) + np.sign((price - sma20))
-                ) / 3.0
-                stack_score = float(stack_score)
-            else:
-                stack_score = 0.0
-        except Exception:
+        # MA structure score: stacking and price vs. MAs
+        if (
+            math.isfinite(sma20) and math.isfinite(sma50)
+            and math.isfinite(sma200) and math.isfinite(price)
+        ):
+            stack_score = (
+                ((sma20 > sma50) - (sma20 < sma50))
+                + ((sma50 > sma200) - (sma50 < sma200))
+                + ((price > sma20) - (price < sma20))
+            ) / 3.0
+        else:
             stack_score = 0.0
-            price = close.iloc[-1]
 
         # RSI normalization: 30 -> -1, 50 -> 0, 70 -> +1
         if rsi <= 30:
@@ -124,11 +438,10 @@ class TechnicalAgent(BaseAgent):
         rsi_score = clip_signal(rsi_score)
 
         # Volume confirmation: volume vs. 20D average
-        vol_avg = volume.rolling(20).mean().iloc[-1]
         vol_boost = 0.0
         try:
             if vol_avg and vol_avg > 0:
-                vol_ratio = float(volume.iloc[-1] / vol_avg)
+                vol_ratio = float(last_volume / vol_avg)
                 # boost magnitude if >1.2x average; cap at +0.15
                 vol_boost = float(min(0.15, max(0.0, (vol_ratio - 1.2) * 0.25)))
         except Exception:
@@ -143,15 +456,16 @@ class TechnicalAgent(BaseAgent):
 
         weights = {"RSI": 0.2, "MACD": 0.3, "Bollinger": 0.2, "MAs": 0.3}
         base_signal = float(
-            sum(components[k] * weights[k] for k in components if np.isfinite(components[k]))
+            sum(components[k] * weights[k] for k in components if math.isfinite(components[k]))
         )
-        signal = clip_signal(base_signal + np.sign(base_signal) * vol_boost)
+        signal = clip_signal(base_signal + _sign(base_signal) * vol_boost)
 
         # Confidence: alignment of indicators with overall sign
         if signal == 0:
             align = 0
         else:
-            align = sum(1 for v in components.values() if np.sign(v) == np.sign(signal) and abs(v) >= 0.35)
+            signal_sign = _sign(signal)
+            align = sum(1 for v in components.values() if _sign(v) == signal_sign and abs(v) >= 0.35)
         confidence = 0.4 + 0.6 * (align / max(1, len(components)))
         confidence = float(max(0.0, min(1.0, confidence)))
 
@@ -159,7 +473,7 @@ class TechnicalAgent(BaseAgent):
 
         rationale_parts = [
             f"RSI(14)={rsi:.1f} -> {rsi_score:+.2f}",
-            f"MACD hist z-> {macd_hist_z.iloc[-1]:+.2f} -> {macd_score:+.2f}",
+            f"MACD hist z-> {macd_val:+.2f} -> {macd_score:+.2f}",
             f"BB pos -> {bb_score:+.2f}",
             f"MA stack -> {stack_score:+.2f}",
             f"Vol boost -> {vol_boost:+.2f}",
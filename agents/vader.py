@@ -0,0 +1,152 @@
+"""
+Exact fast path for VADER compound scores.
+
+``SentimentIntensityAnalyzer.polarity_scores`` re-lowercases the whole token
+list inside its negation and idiom checks for every lexicon hit, scans each
+character for emojis and computes pos/neu/neg proportions that SentimentAgent
+never reads. ``FastVaderAnalyzer.compound`` applies the same rules to a token
+list lowercased once, returns 0.0 straight away for texts without a lexicon
+word, and computes only the compound score. Results are identical to
+``polarity_scores(text)["compound"]``.
+"""
+from __future__ import annotations
+
+from typing import List
+
+from vaderSentiment.vaderSentiment import (
+    BOOSTER_DICT,
+    C_INCR,
+    N_SCALAR,
+    SPECIAL_CASES,
+    SentimentIntensityAnalyzer,
+    SentiText,
+    negated,
+    normalize,
+    scalar_inc_dec,
+)
+
+
+def _negation_check(valence: float, lower: List[str], start_i: int, i: int) -> float:
+    """``SentimentIntensityAnalyzer._negation_check`` on pre-lowercased tokens."""
+    if start_i == 0:
+        if negated([lower[i - (start_i + 1)]]):  # 1 word preceding lexicon word (w/o stopwords)
+            valence = valence * N_SCALAR
+    if start_i == 1:
+        if lower[i - 2] == "never" and (lower[i - 1] == "so" or lower[i - 1] == "this"):
+            valence = valence * 1.25
+        elif lower[i - 2] == "without" and lower[i - 1] == "doubt":
+            valence = valence
+        elif negated([lower[i - (start_i + 1)]]):  # 2 words preceding the lexicon word position
+            valence = valence * N_SCALAR
+    if start_i == 2:
+        if lower[i - 3] == "never" and (lower[i - 2] == "so" or lower[i - 2] == "this") or \
+                (lower[i - 1] == "so" or lower[i - 1] == "this"):
+            valence = valence * 1.25
+        elif lower[i - 3] == "without" and (lower[i - 2] == "doubt" or lower[i - 1] == "doubt"):
+            valence = valence
+        elif negated([lower[i - (start_i + 1)]]):  # 3 words preceding the lexicon word position
+            valence = valence * N_SCALAR
+    return valence
+
+
+def _special_idioms_check(valence: float, lower: List[str], i: int) -> float:
+    """``SentimentIntensityAnalyzer._special_idioms_check`` on pre-lowercased tokens."""
+    onezero = f"{lower[i - 1]} {lower[i]}"
+    twoonezero = f"{lower[i - 2]} {lower[i - 1]} {lower[i]}"
+    twoone = f"{lower[i - 2]} {lower[i - 1]}"
+    threetwoone = f"{lower[i - 3]} {lower[i - 2]} {lower[i - 1]}"
+    threetwo = f"{lower[i - 3]} {lower[i - 2]}"
+
+    for seq in (onezero, twoonezero, twoone, threetwoone, threetwo):
+        if seq in SPECIAL_CASES:
+            valence = SPECIAL_CASES[seq]
+            break
+
+    if len(lower) - 1 > i:
+        zeroone = f"{lower[i]} {lower[i + 1]}"
+        if zeroone in SPECIAL_CASES:
+            valence = SPECIAL_CASES[zeroone]
+    if len(lower) - 1 > i + 1:
+        zeroonetwo = f"{lower[i]} {lower[i + 1]} {lower[i + 2]}"
+        if zeroonetwo in SPECIAL_CASES:
+            valence = SPECIAL_CASES[zeroonetwo]
+
+    # check for booster/dampener bi-grams such as 'sort of' or 'kind of'
+    for n_gram in (threetwoone, threetwo, twoone):
+        if n_gram in BOOSTER_DICT:
+            valence = valence + BOOSTER_DICT[n_gram]
+    return valence
+
+
+class FastVaderAnalyzer(SentimentIntensityAnalyzer):
+    """SentimentIntensityAnalyzer with a compound-only scoring fast path."""
+
+    def compound(self, text: str) -> float:
+        """Return ``polarity_scores(text)["compound"]`` without the per-call overhead."""
+        if not text.isascii():
+            # Emojis (always non-ASCII) are expanded to descriptions by the full path
+            return float(self.polarity_scores(text)["compound"])
+
+        text = text.strip()
+        sentitext = SentiText(text)
+        words = sentitext.words_and_emoticons
+        lower = [w.lower() for w in words]
+        lexicon = self.lexicon
+        if not any(w in lexicon for w in lower):
+            return 0.0  # every token has zero valence
+
+        last = len(words) - 1
+        sentiments = []
+        for i, word in enumerate(lower):
+            if word in BOOSTER_DICT or word not in lexicon or (
+                word == "kind" and i < last and lower[i + 1] == "of"
+            ):
+                sentiments.append(0)
+            else:
+                sentiments.append(self._lexicon_valence(words, lower, i, sentitext.is_cap_diff))
+        sentiments = self._but_check(words, sentiments)
+
+        sum_s = float(sum(sentiments))
+        punct_emph_amplifier = self._punctuation_emphasis(text)
+        if sum_s > 0:
+            sum_s += punct_emph_amplifier
+        elif sum_s < 0:
+            sum_s -= punct_emph_amplifier
+        return round(normalize(sum_s), 4)
+
+    def _lexicon_valence(self, words: List[str], lower: List[str], i: int, is_cap_diff: bool) -> float:
+        """``sentiment_valence`` for a token known to be in the lexicon."""
+        lexicon = self.lexicon
+        word = lower[i]
+        valence = lexicon[word]
+
+        # check for "no" as negation for an adjacent lexicon item vs "no" as its own stand-alone lexicon item
+        if word == "no" and i != len(words) - 1 and lower[i + 1] in lexicon:
+            valence = 0.0
+        if (i > 0 and lower[i - 1] == "no") \
+                or (i > 1 and lower[i - 2] == "no") \
+                or (i > 2 and lower[i - 3] == "no" and lower[i - 1] in ("or", "nor")):
+            valence = lexicon[word] * N_SCALAR
+
+        # check if sentiment laden word is in ALL CAPS (while others aren't)
+        if words[i].isupper() and is_cap_diff:
+            if valence > 0:
+                valence += C_INCR
+            else:
+                valence -= C_INCR
+
+        for start_i in range(0, 3):
+            # dampen the scalar modifier of preceding words based on their distance
+            j = i - (start_i + 1)
+            if i > start_i and lower[j] not in lexicon:
+                s = scalar_inc_dec(words[j], valence, is_cap_diff)
+                if start_i == 1 and s != 0:
+                    s = s * 0.95
+                if start_i == 2 and s != 0:
+                    s = s * 0.9
+                valence = valence + s
+                valence = _negation_check(valence, lower, start_i, i)
+                if start_i == 2:
+                    valence = _special_idioms_check(valence, lower, i)
+
+        return self._least_check(valence, words, i)
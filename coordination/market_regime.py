@@ -18,12 +18,11 @@ The detection uses simple, interpretable rules based on:
 from __future__ import annotations
 
 from typing import Any, Dict, Optional
-from io import StringIO
 
 import numpy as np
-import pandas as pd
 
 from ..utils.logging_utils import get_logger
+from ..utils.serialization import get_or_parse_prices
 
 
 class MarketRegimeDetector:
@@ -56,7 +55,7 @@ class MarketRegimeDetector:
         """
         self.vol_threshold = vol_threshold
         self.logger = get_logger(__name__)
-        self.logger.info(f"MarketRegimeDetector initialized (vol_threshold={vol_threshold})")
+        self.logger.info("MarketRegimeDetector initialized (vol_threshold=%s)", vol_threshold)
 
     def detect(self, market_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -88,48 +87,50 @@ class MarketRegimeDetector:
 
         # Parse index price data
         try:
-            idx = pd.read_json(StringIO(prices_payload["data"]), orient="split")
+            prices, columns = get_or_parse_prices(prices_payload)
+            close = prices[:, columns.index("Close")]
         except Exception as e:
-            self.logger.error(f"Failed to parse index data: {e}")
+            self.logger.error("Failed to parse index data: %s", e)
             return {"regime": "Unknown", "details": {"reason": "Index payload parse error"}}
 
-        if idx is None or idx.empty:
+        if prices.size == 0:
             self.logger.warning("Empty index data received")
             return {"regime": "Unknown", "details": {"reason": "Empty index data"}}
 
-        close = idx["Close"].astype(float).dropna()
+        close = close[~np.isnan(close)]
         
         # Need sufficient history for reliable signals
         if len(close) < 60:
-            self.logger.warning(f"Insufficient index history: {len(close)} days (need 60+)")
+            self.logger.warning("Insufficient index history: %d days (need 60+)", len(close))
             return {"regime": "Unknown", "details": {"reason": "Insufficient index history"}}
 
+        # Only the latest window values matter, so work on array tails instead of
+        # materializing full-length rolling series.
+
         # Calculate 20-day realized volatility (annualized)
-        ret = close.pct_change().dropna()
-        if len(ret) >= 20:
-            vol_20 = float(ret.rolling(20).std(ddof=0).iloc[-1] * np.sqrt(252))
-        else:
-            vol_20 = float(ret.std(ddof=0) * np.sqrt(252))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ret_tail = np.diff(close[-21:]) / close[-21:-1]
+        vol_20 = float(ret_tail.std() * np.sqrt(252))
         
-        self.logger.debug(f"20-day annualized volatility: {vol_20:.2%}")
+        self.logger.debug("20-day annualized volatility: %.2f%%", vol_20 * 100)
 
         # Calculate moving averages for trend determination
-        sma20 = close.rolling(20).mean()
-        sma50 = close.rolling(50).mean()
+        sma20_last = float(close[-20:].mean())
+        sma50_last = float(close[-50:].mean())
         
         # Calculate short-term momentum: 5-day change in SMA(20)
-        if len(sma20) >= 5:
-            slope20 = float((sma20.iloc[-1] - sma20.iloc[-5]) / (abs(sma20.iloc[-5]) + 1e-9))
-        else:
-            slope20 = 0.0
+        sma20_prev = float(close[-24:-4].mean())
+        slope20 = (sma20_last - sma20_prev) / (abs(sma20_prev) + 1e-9)
         
-        self.logger.debug(f"SMA(20)={sma20.iloc[-1]:.2f}, SMA(50)={sma50.iloc[-1]:.2f}, slope={slope20:.4f}")
+        self.logger.debug("SMA(20)=%.2f, SMA(50)=%.2f, slope=%.4f", sma20_last, sma50_last, slope20)
 
         # Apply classification rules
         if vol_20 >= self.vol_threshold:
             regime = "High Volatility"
-            self.logger.info(f"Regime: High Volatility (vol={vol_20:.2%} > {self.vol_threshold:.2%})")
-        elif sma20.iloc[-1] > sma50.iloc[-1] and slope20 > 0:
+            self.logger.info(
+                "Regime: High Volatility (vol=%.2f%% > %.2f%%)", vol_20 * 100, self.vol_threshold * 100
+            )
+        elif sma20_last > sma50_last and slope20 > 0:
             regime = "Bullish"
             self.logger.info("Regime: Bullish (SMA20 > SMA50, positive momentum)")
         else:
@@ -140,7 +141,7 @@ class MarketRegimeDetector:
             "regime": regime,
             "details": {
                 "vol_20_annualized": round(vol_20, 4),
-                "sma20_gt_sma50": bool(sma20.iloc[-1] > sma50.iloc[-1]),
+                "sma20_gt_sma50": bool(sma20_last > sma50_last),
                 "sma20_slope5": round(slope20, 4),
             },
         }
@@ -14,8 +14,11 @@ Key Features:
 """
 from __future__ import annotations
 
+import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import Any, Dict, Iterable, List, Tuple
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Dict, Iterable, List, Mapping, Tuple
 
 import numpy as np
 
@@ -23,6 +26,38 @@ from ..agents.base_agent import BaseAgent
 from ..utils.logging_utils import get_logger
 
 
+@lru_cache(maxsize=64)
+def _base_weights(regime: str, agent_names: Tuple[str, ...]) -> Mapping[str, float]:
+    """Normalized regime weights for ``agent_names`` (see MasterAgent._regime_base_weights)."""
+    # Default distribution across known agents
+    defaults = {
+        "TechnicalAgent": 0.4,
+        "FundamentalAgent": 0.4,
+        "SentimentAgent": 0.2,
+    }
+    if regime == "High Volatility":
+        # In volatile markets, technical analysis is more responsive
+        defaults = {
+            "TechnicalAgent": 0.5,
+            "FundamentalAgent": 0.3,
+            "SentimentAgent": 0.2,
+        }
+    elif regime == "Bearish":
+        # In downturns, fundamentals help identify survivors
+        defaults = {
+            "TechnicalAgent": 0.35,
+            "FundamentalAgent": 0.45,
+            "SentimentAgent": 0.2,
+        }
+    
+    # Keep only for agents present; renormalize
+    base = {name: defaults.get(name, 0.1) for name in agent_names}
+    s = sum(base.values()) or 1.0
+    normalized = {k: v / s for k, v in base.items()}
+    
+    return MappingProxyType(normalized)
+
+
 class MasterAgent:
     """
     Coordination engine that combines independent agent signals with regime-aware weights.
@@ -53,12 +88,30 @@ class MasterAgent:
             min_weight: Minimum weight per agent to prevent complete exclusion. Default 0.1
         """
         self.agents = list(agents)
+        # Display names resolved once; also the key for the base-weight cache
+        self._agent_items: List[Tuple[str, BaseAgent]] = [(a.__class__.__name__, a) for a in self.agents]
+        self._agent_name_tuple: Tuple[str, ...] = tuple(n for n, _ in self._agent_items)
         self.alpha = alpha
         self.min_weight = min_weight
         self.logger = get_logger(__name__)
-        self.logger.info(f"MasterAgent initialized with {len(self.agents)} agents")
+        # Kept for the lifetime of the coordinator so repeated decide() calls
+        # (batch scans, backtests) reuse warm worker threads
+        self._pool = ThreadPoolExecutor(
+            max_workers=max(1, len(self.agents)), thread_name_prefix="masteragent"
+        )
+        self.logger.info("MasterAgent initialized with %d agents", len(self.agents))
+
+    def close(self) -> None:
+        """Shut down the agent worker pool."""
+        try:
+            self._pool.shutdown(wait=False)
+        except Exception:
+            pass
 
-    def _regime_base_weights(self, regime: str, agent_names: List[str]) -> Dict[str, float]:
+    def __del__(self) -> None:
+        self.close()
+
+    def _regime_base_weights(self, regime: str, agent_names: List[str]) -> Mapping[str, float]:
         """
         Determine base weights for each agent based on market regime.
         
@@ -72,35 +125,12 @@ class MasterAgent:
             agent_names: Names of agents to assign weights to
             
         Returns:
-            Dictionary mapping agent name to base weight (normalized to sum=1)
+            Read-only mapping of agent name to base weight (normalized to sum=1),
+            shared between calls with the same regime and agent order
         """
-        # Default distribution across known agents
-        defaults = {
-            "TechnicalAgent": 0.4,
-            "FundamentalAgent": 0.4,
-            "SentimentAgent": 0.2,
-        }
-        if regime == "High Volatility":
-            # In volatile markets, technical analysis is more responsive
-            defaults = {
-                "TechnicalAgent": 0.5,
-                "FundamentalAgent": 0.3,
-                "SentimentAgent": 0.2,
-            }
-        elif regime == "Bearish":
-            # In downturns, fundamentals help identify survivors
-            defaults = {
-                "TechnicalAgent": 0.35,
-                "FundamentalAgent": 0.45,
-                "SentimentAgent": 0.2,
-            }
-        
-        # Keep only for agents present; renormalize
-        base = {name: defaults.get(name, 0.1) for name in agent_names}
-        s = sum(base.values()) or 1.0
-        normalized = {k: v / s for k, v in base.items()}
-        
-        self.logger.debug(f"Regime '{regime}' base weights: {normalized}")
+        normalized = _base_weights(regime, tuple(agent_names))
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("Regime '%s' base weights: %s", regime, dict(normalized))
         return normalized
 
     def _cross_verify(self, results: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
@@ -112,42 +142,52 @@ class MasterAgent:
         when others disagree.
         
         Args:
-            results: Dictionary of agent outputs with signals and confidences
+            results: Dictionary of agent outputs with signals and confidences.
+                Owned by ``decide``; confidences are updated in place
             
         Returns:
-            Adjusted results with confidence dampening applied to outliers
+            ``results``, with confidence dampening applied to outliers
         """
-        signals = {k: v.get("signal", 0.0) for k, v in results.items()}
-        sig_values = list(signals.values())
-        
-        if not sig_values:
+        if not results:
             return results
         
-        avg = float(np.mean(sig_values))
+        names = list(results)
+        n = len(names)
+        sigs = np.fromiter((float(v.get("signal", 0.0)) for v in results.values()), dtype=np.float64, count=n)
+        # Same value as np.mean (sum then divide), without the mean dispatch
+        avg = float(sigs.sum()) / n
         
         # If signals are neutral overall, no dampening needed
         if abs(avg) < 0.05:
             return results
         
-        majority_sign = np.sign(avg)
-        adjusted = {}
-        dampened_agents = []
-        
-        for name, out in results.items():
-            s = float(out.get("signal", 0.0))
-            conf = float(out.get("confidence", 0.0))
-            
-            # Dampen confidence if agent strongly disagrees with majority
-            if abs(s) >= 0.6 and np.sign(s) != majority_sign:
-                conf *= 0.5  # 50% confidence reduction
-                dampened_agents.append(name)
-            
-            adjusted[name] = {**out, "confidence": float(max(0.0, min(1.0, conf)))}
+        # Dampen confidence (50%) of agents strongly disagreeing with the majority
+        confs = np.fromiter((float(v.get("confidence", 0.0)) for v in results.values()), dtype=np.float64, count=n)
+        mask = (np.abs(sigs) >= 0.6) & (np.sign(sigs) != np.sign(avg))
+        confs = np.clip(np.where(mask, confs * 0.5, confs), 0.0, 1.0)
+        dampened_agents = [names[i] for i in np.flatnonzero(mask)]
+        for name, conf in zip(names, confs.tolist()):
+            results[name]["confidence"] = conf
         
         if dampened_agents:
-            self.logger.info(f"Cross-verification dampened: {', '.join(dampened_agents)}")
+            self.logger.info("Cross-verification dampened: %s", ", ".join(dampened_agents))
         
-        return adjusted
+        return results
+
+    def _safe_call(self, name: str, agent: BaseAgent, market_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Run one agent, turning any exception into a neutral error result."""
+        try:
+            out = agent.analyze(market_data)
+            self.logger.debug("%s completed: signal=%s", name, out.get("signal"))
+            return out
+        except Exception as e:
+            self.logger.warning("Agent %s failed: %s", name, e)
+            return {
+                "signal": 0.0, 
+                "confidence": 0.0, 
+                "label": "Error", 
+                "rationale": str(e)
+            }
 
     def decide(self, market_data: Dict[str, Any], regime_info: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -179,25 +219,15 @@ class MasterAgent:
         
         # 1. Collect outputs in parallel for performance
         results: Dict[str, Dict[str, Any]] = {}
-        with ThreadPoolExecutor(max_workers=len(self.agents) or 1) as ex:
+        if len(self.agents) <= 1:
+            # Nothing to overlap with; run inline and skip future scheduling
+            results = {n: self._safe_call(n, a, market_data) for n, a in self._agent_items}
+        else:
             fut_to_name = {
-                ex.submit(agent.analyze, market_data): agent.__class__.__name__ 
-                for agent in self.agents
+                self._pool.submit(self._safe_call, n, a, market_data): n for n, a in self._agent_items
             }
-            
             for fut in as_completed(fut_to_name):
-                name = fut_to_name[fut]
-                try:
-                    results[name] = fut.result()
-                    self.logger.debug(f"{name} completed: signal={results[name].get('signal')}")
-                except Exception as e:
-                    self.logger.warning(f"Agent {name} failed: {e}")
-                    results[name] = {
-                        "signal": 0.0, 
-                        "confidence": 0.0, 
-                        "label": "Error", 
-                        "rationale": str(e)
-                    }
+                results[fut_to_name[fut]] = fut.result()
 
         # 2. Cross verification
         results = self._cross_verify(results)
@@ -205,7 +235,8 @@ class MasterAgent:
         # 3. Regime base weights
         regime = regime_info.get("regime", "Unknown") if isinstance(regime_info, dict) else str(regime_info)
         agent_names = list(results.keys())
-        base_w = self._regime_base_weights(regime, agent_names)
+        # Agent order rather than completion order, so the cache key is stable
+        base_w = self._regime_base_weights(regime, self._agent_name_tuple)
 
         # 4. Confidence adjustment and min-weight enforcement
         adjusted_w = {}
@@ -220,14 +251,13 @@ class MasterAgent:
         norm_w = {k: v / total_w for k, v in adjusted_w.items()}
 
         # 6. Aggregate final score (weighted sum of signals)
-        final_score = 0.0
-        contributions: List[Tuple[str, float]] = []
-        for name, out in results.items():
-            s = float(out.get("signal", 0.0))
-            w = norm_w.get(name, 0.0)
-            contrib = w * s
-            contributions.append((name, contrib))
-            final_score += contrib
+        names = list(results)
+        sigs = np.fromiter(
+            (float(results[n].get("signal", 0.0)) for n in names), dtype=np.float64, count=len(names)
+        )
+        ws = np.fromiter((norm_w.get(n, 0.0) for n in names), dtype=np.float64, count=len(names))
+        contribs = ws * sigs
+        final_score = float(contribs.sum())
 
         # 7. Decision mapping based on threshold rules
         if final_score >= 0.50:
@@ -237,14 +267,11 @@ class MasterAgent:
         else:
             decision = "HOLD"
 
-        # 8. Generate explanation
-        dominant = sorted(contributions, key=lambda kv: abs(kv[1]), reverse=True)[:2]
-        conflicting = [
-            name
-            for name, out in results.items()
-            if np.sign(float(out.get("signal", 0.0))) != np.sign(final_score) 
-            and abs(float(out.get("signal", 0.0))) > 0.2
-        ]
+        # 8. Generate explanation (stable sort keeps agent order on ties)
+        top = np.argsort(-np.abs(contribs), kind="stable")[:2]
+        dominant = [(names[i], float(contribs[i])) for i in top]
+        mask = (np.sign(sigs) != np.sign(final_score)) & (np.abs(sigs) > 0.2)
+        conflicting = [names[i] for i in np.flatnonzero(mask)]
         
         expl_parts = [
             f"Regime: {regime}.",
@@ -265,13 +292,13 @@ class MasterAgent:
         explanation = " ".join(expl_parts)
 
         # Overall confidence is mean of agent confidences
-        overall_conf = float(
-            np.mean([float(v.get("confidence", 0.0)) for v in results.values()]) 
-            if results else 0.0
+        all_confs = np.fromiter(
+            (float(v.get("confidence", 0.0)) for v in results.values()), dtype=np.float64, count=len(results)
         )
+        overall_conf = float(all_confs.sum()) / len(results) if results else 0.0
 
         self.logger.info(
-            f"Decision: {decision}, Score: {final_score:.2f}, Confidence: {overall_conf:.2%}"
+            "Decision: %s, Score: %.2f, Confidence: %.2f%%", decision, final_score, overall_conf * 100
         )
 
         return {
@@ -1,13 +1,67 @@
 from __future__ import annotations
 
-import json
 import os
 import sqlite3
 import threading
 import time
-from typing import Any, Optional
+import weakref
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union
+
+import pandas as pd
 
 from ..utils.logging_utils import get_logger
+from ..utils.serialization import (
+    FEATHER_AVAILABLE,
+    FEATHER_MAGIC,
+    feather_to_frame,
+    frame_to_feather,
+    frame_to_split_json,
+    json_dumps,
+    json_loads,
+    split_payload_to_frame,
+)
+
+try:
+    import zstandard
+except ImportError:
+    # Fallback: store plain JSON text (larger on disk, same results)
+    zstandard = None
+
+# zstd level for cached payloads: ~5-10x smaller JSON at a few us per entry
+ZSTD_LEVEL = 3
+
+# Decoded entries kept in process so repeat reads of hot keys skip SQLite
+MEMORY_CACHE_SIZE = 256
+
+# Per-connection settings: WAL already syncs safely at NORMAL (no fsync per
+# commit), a 64 MB page cache and 256 MB of memory-mapped reads keep hot rows
+# out of read() syscalls, and writers from other processes are waited on
+# for up to 30 s instead of failing with "database is locked"
+CONNECTION_PRAGMAS = (
+    "PRAGMA synchronous=NORMAL;",
+    "PRAGMA cache_size=-65536;",
+    "PRAGMA mmap_size=268435456;",
+    "PRAGMA temp_store=MEMORY;",
+    "PRAGMA busy_timeout=30000;",
+)
+
+
+class _ReaderSlot:
+    """Holds one thread's read connection in CacheManager's thread-local storage."""
+
+    __slots__ = ("conn", "__weakref__")
+
+    def __init__(self, conn: sqlite3.Connection) -> None:
+        self.conn = conn
+
+
+def _release_reader(
+    readers: Set[sqlite3.Connection], lock: threading.RLock, conn: sqlite3.Connection
+) -> None:
+    with lock:
+        readers.discard(conn)
+    conn.close()
 
 
 class CacheManager:
@@ -15,72 +69,244 @@ class CacheManager:
 
     Stores small JSON-serializable payloads keyed by strings. Use for API responses
     and computed snapshots to reduce provider calls and improve resilience.
+    Payloads are zstd-compressed BLOBs when ``zstandard`` is installed; plain
+    JSON text rows (older caches) are still read transparently. DataFrames go
+    through ``set_frame``/``get_frame`` and are stored as Feather bytes.
+
+    Fresh hits are also kept decoded in a small in-process LRU (``memory_size``
+    entries, 0 disables it), so returned values are shared between callers and
+    must be treated as read-only. Writes through this instance invalidate it
+    (``set_frame`` stores the written frame in it directly);
+    rows changed by other processes are seen once the memoized entry expires.
+    Row lookups themselves read memory-mapped pages and cost about as much as
+    an in-memory copy of the database would; decoding dominates a cache hit.
     """
 
-    def __init__(self, db_path: str, default_ttl: int = 3600) -> None:
+    def __init__(
+        self,
+        db_path: str,
+        default_ttl: int = 3600,
+        memory_size: int = MEMORY_CACHE_SIZE,
+        time_func: Callable[[], float] = time.time,
+    ) -> None:
         self.db_path = db_path
         self.default_ttl = default_ttl
-        os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+        # Clock for expiry stamps and checks; tests pass a fake one to skip real waits
+        self._now = time_func
+        # An in-memory database exists only on the one connection that opened it
+        self._in_memory = db_path == ":memory:"
+        cache_dir = os.path.dirname(self.db_path)
+        if cache_dir and not self._in_memory:
+            os.makedirs(cache_dir, exist_ok=True)
         self._lock = threading.RLock()
         self._logger = get_logger(__name__)
+        # Writes go through the shared connection under _lock; reads use one
+        # connection per thread, which WAL lets run concurrently without locking.
+        # A reader is closed when its thread exits (short-lived warm-up pools and
+        # Streamlit script threads would otherwise pile them up) or on close()
+        self._local = threading.local()
+        self._readers: Set[sqlite3.Connection] = set()
+        self._mem: "OrderedDict[Tuple[str, str], Tuple[int, Any]]" = OrderedDict()
+        self._mem_size = memory_size
+        self._mem_lock = threading.Lock()
         self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
-        self._conn.execute("PRAGMA journal_mode=WAL;")
+        # page_size only applies to a new database, so it must precede WAL and the table
+        self._conn.execute("PRAGMA page_size=8192;")
+        if not self._in_memory:
+            self._conn.execute("PRAGMA journal_mode=WAL;")
+        self._configure(self._conn)
         self._conn.execute(
             "CREATE TABLE IF NOT EXISTS cache (\n"
             "  key TEXT PRIMARY KEY,\n"
-            "  value TEXT NOT NULL,\n"
+            "  value BLOB NOT NULL,\n"
             "  expiry INTEGER NOT NULL\n"
             ")"
         )
+        # Lets purge_expired range-scan the expired rows instead of the whole table;
+        # key lookups already go through the primary-key index
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_expiry ON cache(expiry)")
         self._conn.commit()
 
-    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+    @staticmethod
+    def _configure(conn: sqlite3.Connection) -> None:
+        for pragma in CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+
+    def _reader(self) -> sqlite3.Connection:
+        slot = getattr(self._local, "reader", None)
+        if slot is None:
+            # check_same_thread=False only so it can be released from any thread
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._configure(conn)
+            slot = _ReaderSlot(conn)
+            with self._lock:
+                self._readers.add(conn)
+            # The slot lives in this thread's locals, which are dropped when the
+            # thread exits; the finalizer holds no reference to self
+            weakref.finalize(slot, _release_reader, self._readers, self._lock, conn)
+            self._local.reader = slot
+        return slot.conn
+
+    def _codec(self) -> Tuple[Any, Any]:
+        # zstd contexts are not thread-safe, so each thread keeps its own pair
+        codec = getattr(self._local, "codec", None)
+        if codec is None:
+            codec = (zstandard.ZstdCompressor(level=ZSTD_LEVEL), zstandard.ZstdDecompressor())
+            self._local.codec = codec
+        return codec
+
+    def _pack(self, text: str) -> Union[str, bytes]:
+        if zstandard is None:
+            return text
+        return self._codec()[0].compress(text.encode("utf-8"))
+
+    def _unpack(self, stored: Union[str, bytes]) -> Union[str, bytes]:
+        if isinstance(stored, bytes):
+            if zstandard is None:
+                raise RuntimeError("zstandard is required to read compressed cache entries")
+            return self._codec()[1].decompress(stored)
+        return stored
+
+    def _encode(self, value: Any) -> Union[str, bytes]:
+        return self._pack(json_dumps(value))
+
+    def _decode(self, stored: Union[str, bytes]) -> Any:
+        return json_loads(self._unpack(stored))
+
+    def _mem_get(self, slot: Tuple[str, str]) -> Optional[Any]:
+        with self._mem_lock:
+            hit = self._mem.get(slot)
+            if hit is None:
+                return None
+            if hit[0] < int(self._now()):
+                del self._mem[slot]
+                return None
+            self._mem.move_to_end(slot)
+            return hit[1]
+
+    def _mem_put(self, slot: Tuple[str, str], expiry: int, value: Any) -> None:
+        if self._mem_size <= 0:
+            return
+        with self._mem_lock:
+            self._mem[slot] = (expiry, value)
+            self._mem.move_to_end(slot)
+            while len(self._mem) > self._mem_size:
+                self._mem.popitem(last=False)
+
+    def _mem_drop(self, key: str) -> None:
+        with self._mem_lock:
+            self._mem.pop(("json", key), None)
+            self._mem.pop(("frame", key), None)
+
+    def _put(self, key: str, stored: Union[str, bytes], ttl: Optional[int]) -> int:
+        return self._put_many([(key, stored)], ttl)
+
+    def _put_many(self, items: List[Tuple[str, Union[str, bytes]]], ttl: Optional[int]) -> int:
+        """Upsert encoded rows in one transaction and return their shared expiry."""
         ttl = self.default_ttl if ttl is None else ttl
-        expiry = int(time.time()) + int(ttl)
-        payload = json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+        expiry = int(self._now()) + int(ttl)
+        for key, _ in items:
+            self._mem_drop(key)
         with self._lock:
-            self._conn.execute(
+            self._conn.executemany(
                 "INSERT INTO cache(key, value, expiry) VALUES(?,?,?)\n"
                 "ON CONFLICT(key) DO UPDATE SET value=excluded.value, expiry=excluded.expiry",
-                (key, payload, expiry),
+                [(key, stored, expiry) for key, stored in items],
             )
             self._conn.commit()
+        return expiry
 
-    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
-        """Get cached value. If allow_stale=True, returns expired cache instead of None."""
-        now = int(time.time())
-        with self._lock:
-            cur = self._conn.execute("SELECT value, expiry FROM cache WHERE key=?", (key,))
-            row = cur.fetchone()
+    def _lookup(self, key: str, allow_stale: bool) -> Optional[Tuple[Union[str, bytes], int, bool]]:
+        """Return ``(stored, expiry, fresh)`` with the value still encoded, or None on a miss."""
+        query = "SELECT value, expiry FROM cache WHERE key=?"
+        if self._in_memory:
+            with self._lock:
+                row = self._conn.execute(query, (key,)).fetchone()
+        else:
+            row = self._reader().execute(query, (key,)).fetchone()
         if not row:
             return None
-        value_str, expiry = row
-        if expiry < now:
-            if allow_stale:
-                # Return stale cache when allowed (useful for rate limiting fallback)
-                self._logger.info("Returning stale cache for key %s", key)
-                try:
-                    return json.loads(value_str)
-                except Exception as e:
-                    self._logger.warning("Failed to decode stale cache for key %s: %s", key, e)
-                    return None
-            else:
-                # Lazy expiration cleanup
-                try:
-                    with self._lock:
-                        self._conn.execute("DELETE FROM cache WHERE key=?", (key,))
-                        self._conn.commit()
-                except Exception:
-                    pass
+        stored, expiry = row
+        fresh = expiry >= int(self._now())
+        if not fresh:
+            if not allow_stale:
+                # Expired rows are left for purge_expired so reads never take the
+                # write lock, and a later allow_stale lookup can still use them
                 return None
+            # Return stale cache when allowed (useful for rate limiting fallback)
+            self._logger.info("Returning stale cache for key %s", key)
+        return stored, expiry, fresh
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        self._put(key, self._encode(value), ttl)
+
+    def get(self, key: str, allow_stale: bool = False) -> Optional[Any]:
+        """Get cached value. If allow_stale=True, returns expired cache instead of None."""
+        value = self._mem_get(("json", key))
+        if value is not None:
+            return value
+        hit = self._lookup(key, allow_stale)
+        if hit is None:
+            return None
+        stored, expiry, fresh = hit
         try:
-            return json.loads(value_str)
+            value = self._decode(stored)
+            if fresh and value is not None:
+                self._mem_put(("json", key), expiry, value)
+            return value
         except Exception as e:
             self._logger.warning("Failed to decode cache for key %s: %s", key, e)
             return None
 
+    def set_frame(self, key: str, df: pd.DataFrame, ttl: Optional[int] = None) -> None:
+        """Cache a DataFrame as Feather bytes (split-orient JSON without pyarrow).
+
+        With Feather the frame round-trips exactly, so ``df`` itself is memoized
+        and the next ``get_frame`` skips decoding; do not modify it afterwards.
+        """
+        if not FEATHER_AVAILABLE:
+            self._put(key, self._pack(frame_to_split_json(df)), ttl)
+        else:
+            expiry = self._put(key, frame_to_feather(df), ttl)
+            self._mem_put(("frame", key), expiry, df)
+
+    def set_frames(self, frames: Dict[str, pd.DataFrame], ttl: Optional[int] = None) -> None:
+        """``set_frame`` for several keys, written in a single transaction."""
+        if not FEATHER_AVAILABLE:
+            self._put_many([(key, self._pack(frame_to_split_json(df))) for key, df in frames.items()], ttl)
+            return
+        expiry = self._put_many([(key, frame_to_feather(df)) for key, df in frames.items()], ttl)
+        for key, df in frames.items():
+            self._mem_put(("frame", key), expiry, df)
+
+    def get_frame(self, key: str, allow_stale: bool = False) -> Optional[pd.DataFrame]:
+        """Get a DataFrame stored by ``set_frame`` (or a legacy ``{"data": split-JSON}`` envelope)."""
+        df = self._mem_get(("frame", key))
+        if df is not None:
+            return df
+        hit = self._lookup(key, allow_stale)
+        if hit is None:
+            return None
+        stored, expiry, fresh = hit
+        try:
+            if isinstance(stored, bytes) and stored.startswith(FEATHER_MAGIC):
+                if not FEATHER_AVAILABLE:
+                    raise RuntimeError("pyarrow is required to read Feather cache entries")
+                df = feather_to_frame(stored)
+            else:
+                obj = self._decode(stored)
+                if isinstance(obj.get("data"), str):
+                    obj = obj["data"]  # legacy envelope: split JSON nested as a string
+                df = split_payload_to_frame(obj)
+            if fresh:
+                self._mem_put(("frame", key), expiry, df)
+            return df
+        except Exception as e:
+            self._logger.warning("Failed to decode cached frame for key %s: %s", key, e)
+            return None
+
     def purge_expired(self) -> int:
-        now = int(time.time())
+        now = int(self._now())
         with self._lock:
             cur = self._conn.execute("DELETE FROM cache WHERE expiry<?", (now,))
             self._conn.commit()
@@ -89,6 +315,10 @@ class CacheManager:
     def close(self) -> None:
         try:
             with self._lock:
+                for conn in list(self._readers):
+                    conn.close()
+                self._readers.clear()
+                self._mem.clear()
                 self._conn.close()
         except Exception:
             pass
@@ -1,4 +1,5 @@
 """Generate sample data for testing when API is unavailable"""
+import io
 import json
 import sqlite3
 import time
@@ -7,41 +8,97 @@ from datetime import datetime, timedelta
 import pandas as pd
 import numpy as np
 
-def generate_price_data(base_price, days=365):
-    """Generate realistic looking price data"""
+try:
+    import orjson
+except ImportError:
+    # Fallback: stdlib json (slower, same results)
+    orjson = None
+
+try:
+    import pyarrow.feather as feather
+except ImportError:
+    # Fallback: price frames are stored as split-orient JSON
+    feather = None
+
+
+def _dumps(value):
+    """Compact JSON; kept local so the script runs standalone (python -m data.create_sample_cache)"""
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _frame_payload(df):
+    """Price frame as Feather bytes (read back by CacheManager.get_frame), split JSON without pyarrow"""
+    if feather is None:
+        return df.to_json(orient="split", date_format="iso")
+    buf = io.BytesIO()
+    feather.write_feather(df, buf, compression="lz4")
+    return buf.getvalue()
+
+# Shared PCG64 generator; pass ``seed`` to the generators for reproducible data
+_RNG = np.random.default_rng()
+
+# Uniform ranges for the randomized fundamentals fields
+FUNDAMENTAL_RANGES = {
+    "debt_to_equity": (0.3, 1.0),
+    "fcf_yield": (0.02, 0.06),
+    "revenue_yoy": (0.08, 0.20),
+    "earnings_yoy": (0.10, 0.25),
+    "ebitda_margin": (0.15, 0.30),
+}
+
+def generate_price_frames(base_prices, days=365, seed=None):
+    """Generate realistic looking price data for several base prices in one batch of draws"""
+    rng = _RNG if seed is None else np.random.default_rng(seed)
+    base = np.asarray(base_prices, dtype=np.float64)[:, None]
+    n = base.shape[0]
     dates = pd.date_range(end=datetime.now(), periods=days, freq='D')
-    trend = np.arange(days) * (np.random.randn() * 0.5)  # Random trend
-    noise = np.random.randn(days) * (base_price * 0.015)  # 1.5% noise
-    
-    close_prices = base_price + trend + noise
+    noise = rng.standard_normal((n, 4, days))  # close noise, open/high/low multipliers
+    trend = np.arange(days) * (rng.standard_normal((n, 1)) * 0.5)  # Random trend
     
-    data = pd.DataFrame({
-        'Open': close_prices * (1 + np.random.randn(days) * 0.005),
-        'High': close_prices * (1 + abs(np.random.randn(days)) * 0.008),
-        'Low': close_prices * (1 - abs(np.random.randn(days)) * 0.008),
-        'Close': close_prices,
-        'Volume': np.random.randint(int(base_price * 1000), int(base_price * 10000), days),
-        'Adj Close': close_prices,
-    }, index=dates)
+    close_prices = base + trend + noise[:, 0] * (base * 0.015)  # 1.5% noise
+    opens = close_prices * (1 + noise[:, 1] * 0.005)
+    highs = close_prices * (1 + np.abs(noise[:, 2]) * 0.008)
+    lows = close_prices * (1 - np.abs(noise[:, 3]) * 0.008)
+    volumes = rng.integers((base * 1000).astype(np.int64), (base * 10000).astype(np.int64), (n, days))
     
-    return data
+    return [
+        pd.DataFrame({
+            'Open': opens[i],
+            'High': highs[i],
+            'Low': lows[i],
+            'Close': close_prices[i],
+            'Volume': volumes[i],
+            'Adj Close': close_prices[i],
+        }, index=dates)
+        for i in range(n)
+    ]
+
+def generate_price_data(base_price, days=365, seed=None):
+    """Generate realistic looking price data"""
+    return generate_price_frames([base_price], days=days, seed=seed)[0]
 
-def create_sample_cache():
-    """Create sample cached data for multiple popular Indian stocks"""
+def create_sample_cache(db_path=None):
+    """Create sample cached data for multiple popular Indian stocks (in data/cache.sqlite3 by default)"""
     
     # Create cache database
-    cache_dir = os.path.dirname(os.path.abspath(__file__))
-    db_path = os.path.join(cache_dir, "cache.sqlite3")
+    if db_path is None:
+        cache_dir = os.path.dirname(os.path.abspath(__file__))
+        db_path = os.path.join(cache_dir, "cache.sqlite3")
     
     conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA page_size=8192;")  # same layout CacheManager creates
     conn.execute("PRAGMA journal_mode=WAL;")
+    conn.execute("PRAGMA synchronous=NORMAL;")  # sample data is not crash-critical
     conn.execute(
         "CREATE TABLE IF NOT EXISTS cache ("
         "  key TEXT PRIMARY KEY,"
-        "  value TEXT NOT NULL,"
+        "  value BLOB NOT NULL,"
         "  expiry INTEGER NOT NULL"
         ")"
     )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_cache_expiry ON cache(expiry)")  # as CacheManager
     
     # Sample stocks with base prices
     stocks = {
@@ -56,20 +113,22 @@ def create_sample_cache():
     expiry = int(time.time()) + 86400 * 2  # 48 hours
     cache_entries = []
     
-    for symbol, info in stocks.items():
-        # Generate price data
-        price_data = generate_price_data(info["price"], days=365)
+    # Price history for every stock plus the NIFTY 50 index, and the random
+    # fundamentals fields, each drawn in one batch
+    symbols = list(stocks)
+    frames = generate_price_frames([info["price"] for info in stocks.values()] + [22000], days=365)
+    low, high = np.array(list(FUNDAMENTAL_RANGES.values())).T
+    draws = _RNG.uniform(low, high, size=(len(symbols), len(low)))
+    
+    for symbol, price_data, row in zip(symbols, frames, draws.tolist()):
+        info = stocks[symbol]
         
         # Fundamentals
         fundamentals = {
             "pe": info["pe"],
             "pb": info["pb"],
             "roe": info["roe"],
-            "debt_to_equity": np.random.uniform(0.3, 1.0),
-            "fcf_yield": np.random.uniform(0.02, 0.06),
-            "revenue_yoy": np.random.uniform(0.08, 0.20),
-            "earnings_yoy": np.random.uniform(0.10, 0.25),
-            "ebitda_margin": np.random.uniform(0.15, 0.30),
+            **dict(zip(FUNDAMENTAL_RANGES, row)),
             "source": "sample_data"
         }
         
@@ -91,31 +150,31 @@ def create_sample_cache():
         
         cache_entries.extend([
             (f"prices:{symbol}:1y:1d", 
-             json.dumps({"data": price_data.to_json(orient="split", date_format="iso")}, ensure_ascii=False), 
+             _frame_payload(price_data), 
              expiry),
             (f"fundamentals:{symbol}", 
-             json.dumps(fundamentals, ensure_ascii=False), 
+             _dumps(fundamentals), 
              expiry),
             (f"news:{symbol}", 
-             json.dumps(news, ensure_ascii=False), 
+             _dumps(news), 
              expiry)
         ])
     
     # Add NIFTY 50 index data
-    nifty_data = generate_price_data(22000, days=365)
+    nifty_data = frames[-1]
     cache_entries.append((
         "prices:^NSEI:1y:1d",
-        json.dumps({"data": nifty_data.to_json(orient="split", date_format="iso")}, ensure_ascii=False),
+        _frame_payload(nifty_data),
         expiry
     ))
     
-    for key, value, exp in cache_entries:
-        conn.execute(
-            "INSERT INTO cache(key, value, expiry) VALUES(?,?,?) "
-            "ON CONFLICT(key) DO UPDATE SET value=excluded.value, expiry=excluded.expiry",
-            (key, value, exp)
-        )
-    
+    # One statement and one transaction for all rows
+    conn.execute("BEGIN")
+    conn.executemany(
+        "INSERT INTO cache(key, value, expiry) VALUES(?,?,?) "
+        "ON CONFLICT(key) DO UPDATE SET value=excluded.value, expiry=excluded.expiry",
+        cache_entries
+    )
     conn.commit()
     conn.close()
     
@@ -2,51 +2,59 @@ from __future__ import annotations
 
 import json
 import os
+import random
 import time
 import ssl
+import threading
 import certifi
-import urllib3
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from io import StringIO
 from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import pytz
 import yfinance as yf
 import requests
+from curl_cffi import requests as curl_requests
 from functools import wraps
 
 from ..utils.logging_utils import get_logger
+from ..utils.serialization import split_payload_to_frame
 from .cache_manager import CacheManager
 
-# SSL Certificate workaround for yfinance
-try:
-    # Disable SSL warnings
-    urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-    
-    # Configure SSL certificates
-    os.environ['REQUESTS_CA_BUNDLE'] = certifi.where()
-    os.environ['SSL_CERT_FILE'] = certifi.where()
-    os.environ['CURL_CA_BUNDLE'] = certifi.where()
-    
-    # Try to use curl_cffi for better SSL handling
-    try:
-        from curl_cffi import requests as curl_requests
-        _session = curl_requests.Session()
-        _session.verify = False
-    except ImportError:
-        # Fallback: don't use custom session, let yfinance handle it
-        _session = None
-except Exception:
-    _session = None
+# Configure SSL certificates for every HTTP stack yfinance may touch
+os.environ['REQUESTS_CA_BUNDLE'] = certifi.where()
+os.environ['SSL_CERT_FILE'] = certifi.where()
+os.environ['CURL_CA_BUNDLE'] = certifi.where()
+
+# One curl_cffi session for all Yahoo requests: browser impersonation negotiates
+# HTTP/2, and each thread reuses its own keep-alive curl handle
+_session = curl_requests.Session(impersonate="chrome", verify=certifi.where())
 
 
 IST = pytz.timezone("Asia/Kolkata")
 
+# Yahoo serves up to 20 tickers per multi-symbol download request
+PRICE_BATCH_SIZE = 20
+
+# Worker counts for the per-snapshot fetches and for warming many symbols
+SNAPSHOT_WORKERS = 4
+WARM_WORKERS = 8
+
+# yf.download collects its results in module-level state (shared._DFS) that
+# every call resets, so concurrent downloads must not overlap each other
+_DOWNLOAD_LOCK = threading.Lock()
+
 
 def retry_on_failure(max_retries: int = 3, delay: float = 1.0, backoff: float = 2.0):
-    """Decorator for retrying functions with exponential backoff."""
+    """Decorator for retrying functions with exponential backoff.
+
+    Waits are drawn uniformly from ``[0, delay * backoff**attempt]`` (full
+    jitter) so concurrent workers do not retry in lockstep. The last error is
+    re-raised once every attempt has failed.
+    """
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
@@ -57,26 +65,34 @@ def retry_on_failure(max_retries: int = 3, delay: float = 1.0, backoff: float =
                 except Exception as e:
                     last_exception = e
                     if attempt < max_retries - 1:
-                        wait_time = delay * (backoff ** attempt)
+                        wait_time = random.uniform(0, delay * (backoff ** attempt))
                         time.sleep(wait_time)
-            # All retries failed, return None or raise
-            return None
+            raise last_exception
         return wrapper
     return decorator
 
 
+def _yoy(series: pd.Series) -> Optional[float]:
+    """Growth of the newest value over the prior one in a newest-first statement row."""
+    arr = series.dropna().to_numpy(dtype=np.float64)
+    if arr.size < 2:
+        return None
+    return float((arr[0] - arr[1]) / (abs(arr[1]) or 1.0))
+
+
 def _df_to_json(df: pd.DataFrame) -> str:
     return df.to_json(orient="split", date_format="iso")
 
 
 def _df_from_json(s: str) -> pd.DataFrame:
-    return pd.read_json(s, orient="split")
+    return split_payload_to_frame(s)
 
 
 @dataclass
 class PriceBundle:
     symbol: str
     prices: pd.DataFrame  # OHLCV, DatetimeIndex in IST
+    payload_json: Optional[str] = None  # split-orient JSON of prices, filled on first use
 
 
 class DataFetcher:
@@ -100,6 +116,31 @@ class DataFetcher:
         self.cache = CacheManager(self.cache_path, default_ttl=cache_ttl_seconds)
         self.index_ticker = index_ticker
         self.logger = get_logger(__name__)
+        # Last bundle built per cache key, with the cached frame it came from; the
+        # cache hands back the same frame object while its entry is memoized, so
+        # repeated snapshots reuse the IST frame and its serialized payload
+        self._bundles: Dict[str, Tuple[pd.DataFrame, PriceBundle]] = {}
+        # Downloads whose cache write failed, held in process until the cache
+        # TTL would have expired so later snapshots do not download them again
+        self._unsaved: Dict[str, Tuple[float, PriceBundle]] = {}
+        # In-flight price fetches per key: concurrent snapshots that miss the
+        # cache (e.g. every symbol wanting the index) share a single download
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+        # Shared pool for the independent fetches that make up a snapshot
+        self._pool = ThreadPoolExecutor(
+            max_workers=SNAPSHOT_WORKERS, thread_name_prefix="datafetcher"
+        )
+
+    def close(self) -> None:
+        """Shut down the fetch worker pool."""
+        try:
+            self._pool.shutdown(wait=False)
+        except Exception:
+            pass
+
+    def __del__(self) -> None:
+        self.close()
 
     # ------------------------
     # Public API
@@ -108,10 +149,16 @@ class DataFetcher:
         self, symbol: str, period: str = "1y", interval: str = "1d"
     ) -> Dict[str, Any]:
         self.logger.info("Building snapshot for %s", symbol)
-        price_bundle = self._get_price_bundle(symbol, period, interval)
-        fundamentals = self._get_fundamentals(symbol)
-        news = self._get_news(symbol)
-        index_bundle = self._get_price_bundle(self.index_ticker, period, interval)
+        # Prices, fundamentals, news and the index are independent network/cache
+        # round trips, so they run concurrently; results are read in a fixed order
+        price_f = self._pool.submit(self._get_price_bundle, symbol, period, interval)
+        fundamentals_f = self._pool.submit(self._get_fundamentals, symbol)
+        news_f = self._pool.submit(self._get_news, symbol)
+        index_f = self._pool.submit(self._get_price_bundle, self.index_ticker, period, interval)
+        price_bundle = price_f.result()
+        fundamentals = fundamentals_f.result()
+        news = news_f.result()
+        index_bundle = index_f.result()
 
         snapshot: Dict[str, Any] = {
             "price_data": self._bundle_to_dict(price_bundle),
@@ -120,7 +167,7 @@ class DataFetcher:
             "macro": {
                 "index": {
                     "ticker": self.index_ticker,
-                    "prices": self._df_to_payload(index_bundle.prices) if index_bundle else None,
+                    "prices": self._bundle_payload(index_bundle) if index_bundle else None,
                 }
             },
         }
@@ -132,7 +179,23 @@ class DataFetcher:
     def _bundle_to_dict(self, bundle: Optional[PriceBundle]) -> Dict[str, Any]:
         if not bundle:
             return {}
-        return {"symbol": bundle.symbol, "prices": self._df_to_payload(bundle.prices)}
+        return {"symbol": bundle.symbol, "prices": self._bundle_payload(bundle)}
+
+    def _bundle_payload(self, bundle: PriceBundle) -> Optional[Dict[str, Any]]:
+        if bundle.payload_json is None:
+            payload = self._df_to_payload(bundle.prices)
+            if payload is None:
+                return None
+            bundle.payload_json = payload["data"]
+        return {"orient": "split", "data": bundle.payload_json}
+
+    def _cached_bundle(self, key: str, symbol: str, cached: pd.DataFrame) -> PriceBundle:
+        memo = self._bundles.get(key)
+        if memo is not None and memo[0] is cached:
+            return memo[1]
+        bundle = PriceBundle(symbol=symbol, prices=self._ensure_ist(cached))
+        self._bundles[key] = (cached, bundle)
+        return bundle
 
     def _df_to_payload(self, df: Optional[pd.DataFrame]) -> Optional[Dict[str, Any]]:
         if df is None:
@@ -144,45 +207,80 @@ class DataFetcher:
 
     def _payload_to_df(self, payload: Dict[str, Any]) -> Optional[pd.DataFrame]:
         try:
-            return pd.read_json(StringIO(payload["data"]), orient="split")
+            return split_payload_to_frame(payload["data"])
         except Exception:
             return None
 
     def _get_price_bundle(self, symbol: str, period: str, interval: str) -> Optional[PriceBundle]:
         key = f"prices:{symbol}:{period}:{interval}"
+        bundle = self._cache_hit_bundle(key, symbol)
+        if bundle is not None:
+            return bundle
         
-        # Try cache first
-        cached = self.cache.get(key)
-        if cached and isinstance(cached, dict) and "data" in cached:
+        with self._inflight_lock:
+            pending = self._inflight.get(key)
+            if pending is None:
+                pending = self._inflight[key] = Future()
+                owner = True
+            else:
+                owner = False
+        if not owner:
+            return pending.result()
+        try:
+            bundle = self._fetch_price_bundle(key, symbol, period, interval)
+            pending.set_result(bundle)
+            return bundle
+        except BaseException as e:
+            pending.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    def _cache_hit_bundle(self, key: str, symbol: str) -> Optional[PriceBundle]:
+        cached = self.cache.get_frame(key)
+        if cached is not None:
             try:
-                df = pd.read_json(StringIO(cached["data"]), orient="split")
-                df = self._ensure_ist(df)
+                bundle = self._cached_bundle(key, symbol, cached)
                 self.logger.debug("Cache hit for prices: %s", symbol)
-                return PriceBundle(symbol=symbol, prices=df)
+                return bundle
             except Exception as e:
                 self.logger.warning("Cache parse failed for %s: %s", symbol, e)
-        
+        unsaved = self._unsaved.get(key)
+        if unsaved is not None and unsaved[0] >= time.time():
+            return unsaved[1]
+        return None
+
+    def _fetch_price_bundle(self, key: str, symbol: str, period: str, interval: str) -> Optional[PriceBundle]:
         # Attempt fetch with retries
-        df = self._fetch_prices_with_retry(symbol, period, interval)
+        try:
+            df = self._fetch_prices_with_retry(symbol, period, interval)
+        except Exception as e:
+            self.logger.debug("Price fetch retries exhausted for %s: %s", symbol, e)
+            df = None
         if df is not None and not df.empty:
             try:
                 df = self._ensure_ist(df)
-                self.cache.set(key, {"data": df.to_json(orient="split", date_format="iso")})
+                self.cache.set_frame(key, df)
                 self.logger.info("Successfully fetched and cached prices for %s", symbol)
-                return PriceBundle(symbol=symbol, prices=df)
+                bundle = PriceBundle(symbol=symbol, prices=df)
+                self._bundles[key] = (df, bundle)
+                self._unsaved.pop(key, None)
+                return bundle
             except Exception as e:
                 self.logger.error("Failed to cache prices for %s: %s", symbol, e)
-                return PriceBundle(symbol=symbol, prices=df) if df is not None else None
+                bundle = PriceBundle(symbol=symbol, prices=df)
+                self._unsaved[key] = (time.time() + self.cache.default_ttl, bundle)
+                return bundle
         
         # Fetch failed, try to use stale cache (even if expired)
         self.logger.warning("Price fetch failed for %s, trying stale cache", symbol)
-        stale_cached = self.cache.get(key, allow_stale=True)
-        if stale_cached and isinstance(stale_cached, dict) and "data" in stale_cached:
+        stale_cached = self.cache.get_frame(key, allow_stale=True)
+        if stale_cached is not None:
             try:
-                df = pd.read_json(StringIO(stale_cached["data"]), orient="split")
-                df = self._ensure_ist(df)
+                bundle = self._cached_bundle(key, symbol, stale_cached)
                 self.logger.info("Using stale cached data for %s", symbol)
-                return PriceBundle(symbol=symbol, prices=df)
+                return bundle
             except Exception as e:
                 self.logger.error("Failed to load stale cached data for %s: %s", symbol, e)
         
@@ -192,10 +290,8 @@ class DataFetcher:
     def _fetch_prices_with_retry(self, symbol: str, period: str, interval: str) -> Optional[pd.DataFrame]:
         """Fetch prices with retry logic."""
         try:
-            if _session:
+            with _DOWNLOAD_LOCK:
                 df = yf.download(symbol, period=period, interval=interval, auto_adjust=True, progress=False, session=_session)
-            else:
-                df = yf.download(symbol, period=period, interval=interval, auto_adjust=True, progress=False)
             
             if df is None or df.empty:
                 raise ValueError("Empty price data")
@@ -204,12 +300,82 @@ class DataFetcher:
             self.logger.debug("Fetch attempt failed for %s: %s", symbol, e)
             raise
 
+    @retry_on_failure(max_retries=2, delay=3.0, backoff=2.5)
+    def _fetch_prices_batch(self, symbols: List[str], period: str, interval: str) -> Optional[Dict[str, pd.DataFrame]]:
+        """Fetch prices for several symbols in one request.
+
+        Each frame is sliced out with the same (Price, Ticker) column layout a
+        single-symbol download returns; symbols without data are omitted.
+        """
+        try:
+            with _DOWNLOAD_LOCK:
+                df = yf.download(
+                    " ".join(symbols), period=period, interval=interval, auto_adjust=True,
+                    progress=False, threads=False, session=_session
+                )
+            if df is None or df.empty:
+                raise ValueError("Empty price data")
+            frames = {}
+            tickers = set(df.columns.get_level_values("Ticker"))
+            for symbol in symbols:
+                if symbol not in tickers:
+                    continue
+                sub = df.xs(symbol, axis=1, level="Ticker", drop_level=False).dropna(how="all")
+                if not sub.empty:
+                    frames[symbol] = sub
+            return frames
+        except Exception as e:
+            self.logger.debug("Batch fetch attempt failed for %s: %s", symbols, e)
+            raise
+
+    def warm_prices(
+        self, symbols: List[str], period: str = "1y", interval: str = "1d", delay: float = 1.0
+    ) -> Dict[str, bool]:
+        """Fetch and cache prices for many symbols with one request per batch.
+
+        Writes the same cache entries as ``_get_price_bundle``. Returns a dict
+        mapping symbol to whether prices were cached.
+        """
+        results = {}
+        batches = [symbols[i:i + PRICE_BATCH_SIZE] for i in range(0, len(symbols), PRICE_BATCH_SIZE)]
+        for n, batch in enumerate(batches):
+            if n:
+                time.sleep(delay)  # Rate limit friendly, once per batch
+            try:
+                frames = self._fetch_prices_batch(batch, period, interval) or {}
+            except Exception as e:
+                self.logger.warning("Batch price fetch failed for %d symbols: %s", len(batch), e)
+                frames = {}
+            pending = {}
+            for symbol in batch:
+                df = frames.get(symbol)
+                results[symbol] = False
+                if df is None:
+                    continue
+                try:
+                    pending[symbol] = self._ensure_ist(df)
+                except Exception as e:
+                    self.logger.error("Failed to cache prices for %s: %s", symbol, e)
+            if not pending:
+                continue
+            try:
+                # One transaction (and one WAL commit) for the whole batch
+                self.cache.set_frames({f"prices:{s}:{period}:{interval}": df for s, df in pending.items()})
+                results.update(dict.fromkeys(pending, True))
+            except Exception as e:
+                self.logger.error("Failed to cache prices for %d symbols: %s", len(pending), e)
+        return results
+
     def _ensure_ist(self, df: pd.DataFrame) -> pd.DataFrame:
         if not isinstance(df.index, pd.DatetimeIndex):
             return df
-        if df.index.tz is None:
+        tz = df.index.tz
+        if tz is None:
             # yfinance daily often returns tz-naive; assume UTC then convert to IST midnight alignment
             df = df.tz_localize(timezone.utc)
+        elif str(tz) == IST.zone:
+            # Cached frames are stored in IST already; skip the copy tz_convert makes
+            return df
         return df.tz_convert(IST)
 
     def _get_fundamentals(self, symbol: str) -> Optional[Dict[str, Any]]:
@@ -222,7 +388,11 @@ class DataFetcher:
             return cached
         
         # Attempt fetch with retry
-        fundamentals = self._fetch_fundamentals_with_retry(symbol)
+        try:
+            fundamentals = self._fetch_fundamentals_with_retry(symbol)
+        except Exception as e:
+            self.logger.debug("Fundamentals fetch retries exhausted for %s: %s", symbol, e)
+            fundamentals = None
         if fundamentals:
             try:
                 self.cache.set(key, fundamentals, ttl=48 * 3600)
@@ -245,16 +415,13 @@ class DataFetcher:
     def _fetch_fundamentals_with_retry(self, symbol: str) -> Optional[Dict[str, Any]]:
         """Fetch fundamentals with retry logic."""
         try:
-            # Use custom session to handle SSL issues
-            if _session:
-                t = yf.Ticker(symbol, session=_session)
-            else:
-                t = yf.Ticker(symbol)
-            info = getattr(t, "info", {}) or {}
+            # Each statement property is a separate HTTPS request, so only the
+            # ones read below are touched: the balance sheet is never used, and
+            # Ticker.earnings is deprecated (always None) in favour of the
+            # income statement's "Net Income" row
+            t = yf.Ticker(symbol, session=_session)
+            info = t.get_info() or {}
             financials = getattr(t, "financials", None)
-            balance = getattr(t, "balance_sheet", None)
-            cashflow = getattr(t, "cashflow", None)
-            earnings = getattr(t, "earnings", None)
 
             # Initialize values with None; fill best-effort
             pe = info.get("trailingPE") or info.get("forwardPE")
@@ -268,28 +435,23 @@ class DataFetcher:
             earnings_yoy = None
 
             try:
+                market_cap = info.get("marketCap")
+                # FCF yield needs the market cap, so skip the cashflow request without it
+                cashflow = getattr(t, "cashflow", None) if market_cap else None
                 if cashflow is not None and not cashflow.empty and "Free Cash Flow" in cashflow.index:
                     fcf_series = cashflow.loc["Free Cash Flow"].dropna()
                     fcf = float(fcf_series.iloc[0]) if len(fcf_series) else None
-                    market_cap = info.get("marketCap")
                     if fcf is not None and market_cap:
                         fcf_yield = float(fcf) / float(market_cap)
             except Exception:
                 pass
 
             try:
-                if financials is not None and not financials.empty and "Total Revenue" in financials.index:
-                    rev = financials.loc["Total Revenue"].dropna()
-                    if len(rev) >= 2:
-                        revenue_yoy = (float(rev.iloc[0]) - float(rev.iloc[1])) / abs(float(rev.iloc[1]))
-            except Exception:
-                pass
-
-            try:
-                if earnings is not None and not earnings.empty and "Earnings" in earnings.columns:
-                    e = earnings["Earnings"].dropna()
-                    if len(e) >= 2:
-                        earnings_yoy = (float(e.iloc[-1]) - float(e.iloc[-2])) / (abs(float(e.iloc[-2])) or 1.0)
+                if financials is not None and not financials.empty:
+                    if "Total Revenue" in financials.index:
+                        revenue_yoy = _yoy(financials.loc["Total Revenue"])
+                    if "Net Income" in financials.index:
+                        earnings_yoy = _yoy(financials.loc["Net Income"])
             except Exception:
                 pass
 
@@ -314,21 +476,24 @@ class DataFetcher:
         
         Returns dict mapping symbol to success status.
         """
-        results = {}
-        for symbol in symbols:
+        # Prices (including the index) arrive in batched requests, so the
+        # snapshots below only fetch fundamentals and news
+        self.warm_prices(list(symbols) + [self.index_ticker], period=period)
+
+        def warm_one(symbol: str) -> bool:
             try:
                 self.logger.info("Warming cache for %s", symbol)
                 snapshot = self.build_snapshot(symbol, period=period)
-                has_data = bool(
+                return bool(
                     snapshot.get("price_data", {}).get("prices") or 
                     snapshot.get("fundamentals")
                 )
-                results[symbol] = has_data
-                time.sleep(1)  # Rate limit friendly
             except Exception as e:
                 self.logger.error("Cache warming failed for %s: %s", symbol, e)
-                results[symbol] = False
-        return results
+                return False
+
+        with ThreadPoolExecutor(max_workers=WARM_WORKERS, thread_name_prefix="warmcache") as pool:
+            return dict(zip(symbols, pool.map(warm_one, symbols)))
     
     def _get_news(self, symbol: str) -> List[Dict[str, Any]]:
         key = f"news:{symbol}"
@@ -5,9 +5,10 @@ Run this periodically (e.g., once daily) to maintain fresh cache and avoid rate
 from __future__ import annotations
 
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import List
 
-from multi_agent_stock_platform.data.data_fetcher import DataFetcher
+from multi_agent_stock_platform.data.data_fetcher import WARM_WORKERS, DataFetcher
 from multi_agent_stock_platform.utils.logging_utils import get_logger
 
 logger = get_logger(__name__)
@@ -43,7 +44,7 @@ def warm_cache(symbols: List[str] = None, delay: float = 2.0) -> None:
     
     Args:
         symbols: List of stock symbols (default: POPULAR_STOCKS)
-        delay: Delay in seconds between requests to avoid rate limits
+        delay: Delay in seconds between batched price requests to avoid rate limits
     """
     if symbols is None:
         symbols = POPULAR_STOCKS
@@ -51,10 +52,12 @@ def warm_cache(symbols: List[str] = None, delay: float = 2.0) -> None:
     fetcher = DataFetcher(cache_ttl_seconds=7200)  # 2 hour cache
     
     logger.info("Starting cache warming for %d symbols", len(symbols))
-    success_count = 0
-    fail_count = 0
     
-    for i, symbol in enumerate(symbols, 1):
+    # One download per batch of up to 20 symbols (and the index) instead of one per symbol
+    fetcher.warm_prices(list(symbols) + [fetcher.index_ticker], period="1y", delay=delay)
+    
+    def warm_one(item) -> bool:
+        i, symbol = item
         try:
             logger.info("[%d/%d] Fetching data for %s...", i, len(symbols), symbol)
             snapshot = fetcher.build_snapshot(symbol, period="1y")
@@ -65,20 +68,21 @@ def warm_cache(symbols: List[str] = None, delay: float = 2.0) -> None:
             if has_prices or has_fundamentals:
                 logger.info("✓ Successfully cached %s (prices: %s, fundamentals: %s)", 
                            symbol, has_prices, has_fundamentals)
-                success_count += 1
-            else:
-                logger.warning("⚠ No data available for %s", symbol)
-                fail_count += 1
-            
-            # Rate limiting: wait between requests
-            if i < len(symbols):
-                logger.debug("Waiting %.1f seconds before next request...", delay)
-                time.sleep(delay)
+                return True
+            logger.warning("⚠ No data available for %s", symbol)
+            return False
                 
         except Exception as e:
             logger.error("✗ Failed to cache %s: %s", symbol, e)
-            fail_count += 1
             time.sleep(delay * 2)  # Wait longer after errors
+            return False
+    
+    # Fundamentals and news for several symbols are fetched concurrently
+    with ThreadPoolExecutor(max_workers=WARM_WORKERS, thread_name_prefix="warmcache") as pool:
+        outcomes = list(pool.map(warm_one, enumerate(symbols, 1)))
+    fetcher.close()
+    success_count = sum(outcomes)
+    fail_count = len(outcomes) - success_count
     
     logger.info("Cache warming completed: %d success, %d failed", success_count, fail_count)
 
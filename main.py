@@ -18,17 +18,23 @@ import json
 import sys
 from datetime import datetime
 
-from multi_agent_stock_platform.data.data_fetcher import DataFetcher
-from multi_agent_stock_platform.agents.technical_agent import TechnicalAgent
-from multi_agent_stock_platform.agents.fundamental_agent import FundamentalAgent
-from multi_agent_stock_platform.agents.sentiment_agent import SentimentAgent
-from multi_agent_stock_platform.coordination.market_regime import MarketRegimeDetector
-from multi_agent_stock_platform.coordination.master_agent import MasterAgent
 from multi_agent_stock_platform.utils.logging_utils import get_logger
-from multi_agent_stock_platform.utils.result_storage import ResultStorage
 
 logger = get_logger(__name__)
 
+SEPARATOR = "=" * 60
+
+# One agent's block in the breakdown, filled from its result dict with these defaults
+AGENT_ROW = (
+    "🔹 {name}\n"
+    "   Signal: {signal:+.2f}\n"
+    "   Confidence: {confidence:.2%}\n"
+    "   Weight: {weight:.2f}\n"
+    "   Label: {label}\n"
+    "   Rationale: {rationale}\n"
+)
+AGENT_ROW_DEFAULTS = {"signal": 0, "confidence": 0, "label": "N/A", "rationale": "N/A"}
+
 
 def main() -> None:
     """
@@ -55,25 +61,41 @@ def main() -> None:
         action="store_true",
         help="Enable verbose logging output"
     )
+    parser.add_argument(
+        "--finbert-model",
+        metavar="DIR",
+        help="Directory with an ONNX FinBERT export for sentiment (falls back to VADER)"
+    )
     
     args = parser.parse_args()
     
+    # Imported after argument parsing: pandas, yfinance and the numba kernels
+    # take about a second to load, which --help and usage errors never need
+    from multi_agent_stock_platform.data.data_fetcher import DataFetcher
+    from multi_agent_stock_platform.agents.technical_agent import TechnicalAgent
+    from multi_agent_stock_platform.agents.fundamental_agent import FundamentalAgent
+    from multi_agent_stock_platform.agents.sentiment_agent import SentimentAgent
+    from multi_agent_stock_platform.coordination.market_regime import MarketRegimeDetector
+    from multi_agent_stock_platform.coordination.master_agent import MasterAgent
+    from multi_agent_stock_platform.utils.result_storage import ResultStorage
+    
     try:
         logger.info(f"Starting analysis for {args.symbol}")
-        print(f"\n{'='*60}")
+        print(f"\n{SEPARATOR}")
         print(f"Multi-Agent Stock Analysis: {args.symbol}")
         print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print(f"{'='*60}\n")
+        print(f"{SEPARATOR}\n")
         
         # Fetch market data
         print("📊 Fetching market data...")
         fetcher = DataFetcher()
         snapshot = fetcher.build_snapshot(args.symbol)
+        fetcher.close()
         print("✓ Market data fetched successfully\n")
         
         # Initialize agents
         print("🤖 Initializing analysis agents...")
-        agents = [TechnicalAgent(), FundamentalAgent(), SentimentAgent()]
+        agents = [TechnicalAgent(), FundamentalAgent(), SentimentAgent(args.finbert_model)]
         print(f"   • Technical Agent: Analyzing price patterns and indicators")
         print(f"   • Fundamental Agent: Evaluating financial metrics")
         print(f"   • Sentiment Agent: Assessing news and market sentiment")
@@ -89,55 +111,57 @@ def main() -> None:
         print("⚙️  Running master agent coordination...")
         master = MasterAgent(agents)
         decision = master.decide(snapshot, regime_info)
+        master.close()
         decision["regime"] = regime_info
         print("✓ Analysis completed\n")
         
-        # Display results
-        print(f"{'='*60}")
-        print("ANALYSIS RESULTS")
-        print(f"{'='*60}")
-        print(f"\n🎯 Decision: {decision.get('decision', 'N/A')}")
-        print(f"📈 Final Score: {decision.get('final_score', 0):+.2f}")
-        print(f"🎲 Confidence: {decision.get('overall_confidence', 0):.2%}")
-        print(f"\n💡 Explanation:")
-        print(f"   {decision.get('explanation', 'N/A')}\n")
+        # Display results; the report is collected and written in one call
+        out = []
+        out.append(SEPARATOR)
+        out.append("ANALYSIS RESULTS")
+        out.append(SEPARATOR)
+        out.append(f"\n🎯 Decision: {decision.get('decision', 'N/A')}")
+        out.append(f"📈 Final Score: {decision.get('final_score', 0):+.2f}")
+        out.append(f"🎲 Confidence: {decision.get('overall_confidence', 0):.2%}")
+        out.append(f"\n💡 Explanation:")
+        out.append(f"   {decision.get('explanation', 'N/A')}\n")
         
         # Agent breakdown
-        print(f"{'='*60}")
-        print("AGENT BREAKDOWN")
-        print(f"{'='*60}\n")
+        out.append(SEPARATOR)
+        out.append("AGENT BREAKDOWN")
+        out.append(f"{SEPARATOR}\n")
         agents_output = decision.get("agents", {})
         weights = decision.get("weights", {})
         
         for agent_name, agent_result in agents_output.items():
-            print(f"🔹 {agent_name}")
-            print(f"   Signal: {agent_result.get('signal', 0):+.2f}")
-            print(f"   Confidence: {agent_result.get('confidence', 0):.2%}")
-            print(f"   Weight: {weights.get(agent_name, 0):.2f}")
-            print(f"   Label: {agent_result.get('label', 'N/A')}")
-            print(f"   Rationale: {agent_result.get('rationale', 'N/A')}\n")
+            out.append(AGENT_ROW.format_map({
+                **AGENT_ROW_DEFAULTS, **agent_result,
+                "name": agent_name, "weight": weights.get(agent_name, 0),
+            }))
         
         # Save result if requested
         if args.save:
             try:
                 storage = ResultStorage()
                 saved_path = storage.save_result(args.symbol, decision)
-                print(f"💾 Result saved to: {saved_path}\n")
+                out.append(f"💾 Result saved to: {saved_path}\n")
             except Exception as e:
                 logger.error(f"Failed to save result: {e}")
-                print(f"⚠️  Warning: Could not save result to file\n")
+                out.append(f"⚠️  Warning: Could not save result to file\n")
         
         # Output full JSON for programmatic use
         if args.verbose:
-            print(f"{'='*60}")
-            print("FULL JSON OUTPUT")
-            print(f"{'='*60}\n")
-            print(json.dumps(decision, ensure_ascii=False, indent=2))
+            out.append(SEPARATOR)
+            out.append("FULL JSON OUTPUT")
+            out.append(f"{SEPARATOR}\n")
+            out.append(json.dumps(decision, ensure_ascii=False, indent=2))
         
-        print(f"{'='*60}")
-        print("⚠️  DISCLAIMER: This is for informational purposes only.")
-        print("   Not financial advice. Do your own research.")
-        print(f"{'='*60}\n")
+        out.append(SEPARATOR)
+        out.append("⚠️  DISCLAIMER: This is for informational purposes only.")
+        out.append("   Not financial advice. Do your own research.")
+        out.append(f"{SEPARATOR}\n")
+        sys.stdout.write("\n".join(out) + "\n")
+        sys.stdout.flush()
         
     except KeyboardInterrupt:
         print("\n\n⚠️  Analysis interrupted by user")
@@ -40,6 +40,18 @@ def get_fetcher() -> DataFetcher:
     return DataFetcher()
 
 
+@st.cache_resource(show_spinner=False)
+def get_master() -> MasterAgent:
+    # Agents keep no per-call state in analyze(), so one coordinator (and its
+    # worker pool) serves every rerun and session
+    return MasterAgent([TechnicalAgent(), FundamentalAgent(), SentimentAgent()])
+
+
+@st.cache_resource(show_spinner=False)
+def get_regime_detector() -> MarketRegimeDetector:
+    return MarketRegimeDetector()
+
+
 def run_analysis(symbol: str) -> Dict[str, Any]:
     """
     Run complete multi-agent analysis for a given stock symbol.
@@ -56,11 +68,9 @@ def run_analysis(symbol: str) -> Dict[str, Any]:
     fetcher = get_fetcher()
     snapshot = fetcher.build_snapshot(symbol)
     
-    # Initialize agents and run analysis
-    agents = [TechnicalAgent(), FundamentalAgent(), SentimentAgent()]
-    regime_info = MarketRegimeDetector().detect(snapshot)
-    master = MasterAgent(agents)
-    decision = master.decide(snapshot, regime_info)
+    # Run the agents; they run concurrently inside MasterAgent.decide
+    regime_info = get_regime_detector().detect(snapshot)
+    decision = get_master().decide(snapshot, regime_info)
     decision["regime"] = regime_info
     
     # Save result to disk for audit trail
@@ -0,0 +1,26 @@
+"""
+Optional Numba JIT support.
+
+``njit`` compiles numeric kernels with Numba when it is installed and otherwise
+returns the function unchanged, so callers keep working (at interpreter speed)
+on environments where Numba is unavailable.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable
+
+try:
+    from numba import njit as _numba_njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    _numba_njit = None
+    NUMBA_AVAILABLE = False
+
+
+def njit(*args: Any, **kwargs: Any) -> Callable:
+    """Drop-in for ``numba.njit`` supporting both ``@njit`` and ``@njit(...)``."""
+    if _numba_njit is not None:
+        return _numba_njit(*args, **kwargs)
+    if len(args) == 1 and callable(args[0]) and not kwargs:
+        return args[0]
+    return lambda func: func
@@ -1,11 +1,15 @@
 import logging
+from functools import lru_cache
 from typing import Optional
 
 
+@lru_cache(maxsize=None)
 def get_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     """Create or retrieve a configured logger with a concise format.
 
     This avoids duplicate handlers and keeps logs consistent across CLI and UI.
+    Memoized per (name, level), so agent and fetcher constructors get their
+    logger back from a dict hit.
     """
     logger = logging.getLogger(name)
     if not logger.handlers:
@@ -10,6 +10,11 @@ def clip_signal(x: float, low: float = -1.0, high: float = 1.0) -> float:
     return float(max(low, min(high, x)))
 
 
+def clip_signal_arr(x: np.ndarray, low: float = -1.0, high: float = 1.0) -> np.ndarray:
+    """Elementwise ``clip_signal`` (NaN stays NaN)."""
+    return np.clip(np.asarray(x, dtype=np.float64), low, high)
+
+
 def to_unit_interval(x: float, xmin: float, xmax: float) -> float:
     if xmin == xmax:
         return 0.5
@@ -17,17 +22,28 @@ def to_unit_interval(x: float, xmin: float, xmax: float) -> float:
     return float(max(0.0, min(1.0, v)))
 
 
+def to_unit_interval_arr(x: np.ndarray, xmin: float, xmax: float) -> np.ndarray:
+    """Elementwise ``to_unit_interval`` (NaN stays NaN)."""
+    x = np.asarray(x, dtype=np.float64)
+    if xmin == xmax:
+        return np.full(x.shape, 0.5)
+    return np.clip((x - xmin) / (xmax - xmin), 0.0, 1.0)
+
+
 def to_negpos_one(x: float, center: float, low: float, high: float) -> float:
     if high == center and x >= center:
         return 1.0
     if center == low and x < center:
         return -1.0
+    # clip_signal inlined as compares: the call plus builtin min/max cost more
+    # than the arithmetic itself in CPython
     if x >= center:
-        denom = (high - center) if high != center else 1.0
-        return clip_signal((x - center) / denom)
+        v = (x - center) / ((high - center) if high != center else 1.0)
     else:
-        denom = (center - low) if center != low else 1.0
-        return -clip_signal((center - x) / denom)
+        v = (center - x) / ((center - low) if center != low else 1.0)
+    v = v if v < 1.0 else 1.0
+    v = v if v > -1.0 else -1.0
+    return float(v) if x >= center else -float(v)
 
 
 def safe_ratio(numerator: Optional[float], denominator: Optional[float], default: Optional[float] = None) -> Optional[float]:
@@ -42,6 +58,22 @@ def safe_ratio(numerator: Optional[float], denominator: Optional[float], default
 def zscore_cap(series: pd.Series, cap: float = 3.0) -> pd.Series:
     if series is None or len(series) == 0:
         return series
+    if series.dtype.kind in "biuf":
+        values = series.to_numpy(dtype=np.float64)
+        if not np.isnan(values).any():
+            # Same mean/std/clip arithmetic as the pandas path, without
+            # nanops dispatch or the intermediate Series. The deviations are
+            # computed once and shared by the std (the sum of squares np.std
+            # takes, so the result is bit-identical) and the normalization,
+            # which then runs in place
+            dev = values - values.mean()
+            sq = dev * dev
+            std = np.sqrt(sq.sum() / len(dev))
+            if std == 0 or np.isnan(std):
+                return pd.Series(np.zeros(len(series)), index=series.index)
+            dev /= std
+            np.clip(dev, -cap, cap, out=dev)
+            return pd.Series(dev, index=series.index, name=series.name)
     std = series.std(ddof=0)
     if std == 0 or pd.isna(std):
         return pd.Series(np.zeros(len(series)), index=series.index)
@@ -66,3 +98,16 @@ def rescale_by_thresholds(x: float, neg_full: float, neg_zero: float, pos_zero:
     if x < pos_full:
         return (x - pos_zero) / (pos_full - pos_zero)
     return 1.0
+
+
+def rescale_by_thresholds_arr(
+    x: np.ndarray, neg_full: float, neg_zero: float, pos_zero: float, pos_full: float
+) -> np.ndarray:
+    """Elementwise ``rescale_by_thresholds``; NaN maps to 1.0 like the scalar version."""
+    x = np.asarray(x, dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        return np.select(
+            [x <= neg_full, x < neg_zero, x <= pos_zero, x < pos_full],
+            [-1.0, -1.0 + (x - neg_full) / (neg_zero - neg_full), 0.0, (x - pos_zero) / (pos_full - pos_zero)],
+            default=1.0,
+        )
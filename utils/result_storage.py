@@ -6,16 +6,45 @@ Each result is stored as a JSON file with timestamp and symbol information.
 """
 from __future__ import annotations
 
+import heapq
 import json
 import os
-from datetime import datetime
+import re
+import threading
+from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .logging_utils import get_logger
+from .serialization import json_dumps_bytes, json_loads
 
 logger = get_logger(__name__)
 
+# fdatasync skips the inode timestamp flush; not available on Windows or macOS
+_datasync = getattr(os, "fdatasync", os.fsync)
+_TMP_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_BINARY", 0)
+# save_result's stamp, optionally followed by the same-second counter: "_20251224_143052[_1].json"
+_STAMP_RE = re.compile(r"_(\d{8}_\d{6})(?:_\d+)?\.json$")
+
+
+def _fsync_dir(path: Path) -> None:
+    """Flush a directory's entries (a new or removed name) to disk; POSIX only."""
+    if os.name != "posix":
+        # Windows cannot open a directory as a file; NTFS journals the name itself
+        return
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+@lru_cache(maxsize=256)
+def _file_prefix(symbol: str) -> str:
+    """Filename prefix of a symbol's results, dots replaced (``RELIANCE.NS`` -> ``RELIANCE_NS_``)."""
+    return symbol.replace(".", "_") + "_"
+
 
 class ResultStorage:
     """
@@ -41,13 +70,78 @@ class ResultStorage:
         
         self.results_dir = Path(results_dir)
         self.results_dir.mkdir(parents=True, exist_ok=True)
-        logger.info(f"ResultStorage initialized. Saving to: {self.results_dir}")
+        logger.info("ResultStorage initialized. Saving to: %s", self.results_dir)
+    
+    def _scan(self, prefix: str = "") -> List[Tuple[float, int, str, str]]:
+        """
+        List result files whose name starts with ``prefix`` in one directory pass.
+
+        Returns:
+            ``(mtime, size, path, name)`` per file, in directory order
+        """
+        entries = []
+        with os.scandir(self.results_dir) as it:
+            for entry in it:
+                name = entry.name
+                if prefix and not name.startswith(prefix):
+                    continue
+                if name.endswith(".json") and entry.is_file():
+                    st = entry.stat()
+                    entries.append((st.st_mtime, st.st_size, entry.path, name))
+        return entries
+    
+    def _write_new(self, stem: str, data: bytes, durable: bool) -> Path:
+        """
+        Write ``data`` to a new ``{stem}.json``, never replacing an existing file.
+
+        The bytes go to a hidden temp file first and are published under the
+        final name in one step, so readers never see a partially written
+        result. A second save for the same symbol within the same second (from
+        this or another process) gets ``{stem}_1.json``, ``{stem}_2.json``, ...
+        With ``durable`` the file's data and then the directory entry are
+        flushed, so the published name survives a crash as well.
+        """
+        # Unique per writing thread; created like open() would, so the umask applies
+        tmp = self.results_dir / f".{stem}.{os.getpid()}.{threading.get_ident()}.tmp"
+        fd = os.open(tmp, _TMP_FLAGS, 0o666)
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(data)
+                if durable:
+                    f.flush()
+                    _datasync(f.fileno())
+            n = 0
+            while True:
+                filepath = self.results_dir / (f"{stem}.json" if n == 0 else f"{stem}_{n}.json")
+                try:
+                    # link() fails instead of replacing an existing name, unlike rename()
+                    os.link(tmp, filepath)
+                except FileExistsError:
+                    n += 1
+                    continue
+                except OSError:
+                    # Filesystem without hard links (FAT, some network shares)
+                    if filepath.exists():
+                        n += 1
+                        continue
+                    os.replace(tmp, filepath)
+                break
+        finally:
+            try:
+                os.unlink(tmp)
+            except FileNotFoundError:
+                pass
+        if durable:
+            _fsync_dir(self.results_dir)
+        return filepath
     
     def save_result(
         self, 
         symbol: str, 
         result: Dict[str, Any], 
-        metadata: Optional[Dict[str, Any]] = None
+        metadata: Optional[Dict[str, Any]] = None,
+        indent: bool = True,
+        durable: bool = False,
     ) -> str:
         """
         Save an analysis result to disk.
@@ -56,6 +150,12 @@ class ResultStorage:
             symbol: Stock symbol (e.g., 'RELIANCE.NS')
             result: The complete analysis result dictionary
             metadata: Optional metadata to include (user info, settings, etc.)
+            indent: Pretty-print for people reading the audit trail (default);
+                    False writes compact JSON, about half the size, for bulk
+                    machine-written results
+            durable: Flush the file (fdatasync where available) and its
+                     directory entry to disk before returning. Off by default:
+                     writes are left to the OS cache
         
         Returns:
             Path to the saved file
@@ -64,16 +164,16 @@ class ResultStorage:
             IOError: If file cannot be written
         """
         try:
-            # Generate timestamp-based filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            # Generate timestamp-based filename; one clock read, so the name and
+            # the payload timestamp always agree
+            now = datetime.now()
+            timestamp = now.strftime("%Y%m%d_%H%M%S")
             # Sanitize symbol for filename (replace dots with underscores)
-            safe_symbol = symbol.replace(".", "_")
-            filename = f"{safe_symbol}_{timestamp}.json"
-            filepath = self.results_dir / filename
+            stem = f"{_file_prefix(symbol)}{timestamp}"
             
             # Prepare complete output with metadata
             output = {
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now.isoformat(),
                 "symbol": symbol,
                 "result": result,
             }
@@ -81,15 +181,15 @@ class ResultStorage:
             if metadata:
                 output["metadata"] = metadata
             
-            # Write to file with pretty formatting
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(output, f, indent=2, ensure_ascii=False)
+            # Write to file (orjson when installed); the encoder's bytes go out
+            # in one write, without a text-mode wrapper
+            filepath = self._write_new(stem, json_dumps_bytes(output, indent=indent), durable)
             
-            logger.info(f"Result saved successfully: {filename}")
+            logger.info("Result saved successfully: %s", filepath.name)
             return str(filepath)
             
         except Exception as e:
-            logger.error(f"Failed to save result for {symbol}: {e}")
+            logger.error("Failed to save result for %s: %s", symbol, e)
             raise IOError(f"Could not save result: {e}")
     
     def get_latest_result(self, symbol: str) -> Optional[Dict[str, Any]]:
@@ -103,30 +203,27 @@ class ResultStorage:
             The latest result dictionary, or None if not found
         """
         try:
-            safe_symbol = symbol.replace(".", "_")
-            pattern = f"{safe_symbol}_*.json"
-            
             # Find all matching files
-            matching_files = sorted(
-                self.results_dir.glob(pattern),
-                key=lambda p: p.stat().st_mtime,
-                reverse=True
-            )
+            matching_files = self._scan(_file_prefix(symbol))
             
             if not matching_files:
-                logger.debug(f"No saved results found for {symbol}")
+                logger.debug("No saved results found for %s", symbol)
                 return None
             
-            # Read the most recent file
-            latest_file = matching_files[0]
-            with open(latest_file, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            # Read the most recent file (the first one on mtime ties, as the sort did)
+            latest_file = Path(max(matching_files, key=lambda e: e[0])[2])
+            raw = latest_file.read_bytes()
+            try:
+                data = json_loads(raw)
+            except ValueError:
+                # Files written by the stdlib encoder may hold NaN/Infinity tokens
+                data = json.loads(raw)
             
-            logger.info(f"Retrieved latest result for {symbol} from {latest_file.name}")
+            logger.info("Retrieved latest result for %s from %s", symbol, latest_file.name)
             return data
             
         except Exception as e:
-            logger.error(f"Failed to retrieve latest result for {symbol}: {e}")
+            logger.error("Failed to retrieve latest result for %s: %s", symbol, e)
             return None
     
     def list_results(self, symbol: Optional[str] = None, limit: int = 10) -> list:
@@ -141,40 +238,34 @@ class ResultStorage:
             List of result file information dictionaries
         """
         try:
-            if symbol:
-                safe_symbol = symbol.replace(".", "_")
-                pattern = f"{safe_symbol}_*.json"
-            else:
-                pattern = "*.json"
-            
-            # Find and sort files by modification time
-            files = sorted(
-                self.results_dir.glob(pattern),
-                key=lambda p: p.stat().st_mtime,
-                reverse=True
-            )[:limit]
+            prefix = _file_prefix(symbol) if symbol else ""
+            
+            # Newest files first; nlargest keeps sorted(reverse=True)[:limit] order
+            files = heapq.nlargest(limit, self._scan(prefix), key=lambda e: e[0])
             
             results = []
-            for filepath in files:
-                stat = filepath.stat()
+            for mtime, size, path, name in files:
                 results.append({
-                    "filename": filepath.name,
-                    "path": str(filepath),
-                    "size_bytes": stat.st_size,
-                    "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                    "filename": name,
+                    "path": path,
+                    "size_bytes": size,
+                    "modified": datetime.fromtimestamp(mtime).isoformat(),
                 })
             
-            logger.debug(f"Listed {len(results)} results (symbol={symbol}, limit={limit})")
+            logger.debug("Listed %d results (symbol=%s, limit=%s)", len(results), symbol, limit)
             return results
             
         except Exception as e:
-            logger.error(f"Failed to list results: {e}")
+            logger.error("Failed to list results: %s", e)
             return []
     
     def cleanup_old_results(self, days: int = 30) -> int:
         """
         Delete result files older than specified days.
         
+        A file's age is the save time stamped in its name; files named some
+        other way are aged by their modification time.
+        
         Args:
             days: Delete files older than this many days
             
@@ -182,20 +273,36 @@ class ResultStorage:
             Number of files deleted
         """
         try:
-            from datetime import timedelta
             cutoff_time = datetime.now() - timedelta(days=days)
             cutoff_timestamp = cutoff_time.timestamp()
+            # Fixed-width stamps compare chronologically as strings
+            cutoff_stamp = cutoff_time.strftime("%Y%m%d_%H%M%S")
+            
+            # Age comes from the save time in the filename, so no file is stat'ed;
+            # names without a stamp fall back to the file's mtime
+            old_files = []
+            with os.scandir(self.results_dir) as it:
+                for entry in it:
+                    name = entry.name
+                    if not name.endswith(".json") or not entry.is_file():
+                        continue
+                    match = _STAMP_RE.search(name)
+                    if match:
+                        expired = match.group(1) < cutoff_stamp
+                    else:
+                        expired = entry.stat().st_mtime < cutoff_timestamp
+                    if expired:
+                        old_files.append((entry.path, name))
             
             deleted_count = 0
-            for filepath in self.results_dir.glob("*.json"):
-                if filepath.stat().st_mtime < cutoff_timestamp:
-                    filepath.unlink()
-                    deleted_count += 1
-                    logger.debug(f"Deleted old result: {filepath.name}")
+            for path, name in old_files:
+                os.unlink(path)
+                deleted_count += 1
+                logger.debug("Deleted old result: %s", name)
             
-            logger.info(f"Cleanup completed: {deleted_count} files deleted (older than {days} days)")
+            logger.info("Cleanup completed: %d files deleted (older than %s days)", deleted_count, days)
             return deleted_count
             
         except Exception as e:
-            logger.error(f"Cleanup failed: {e}")
+            logger.error("Cleanup failed: %s", e)
             return 0
@@ -0,0 +1,239 @@
+"""
+Serialization helpers for market data payloads.
+
+Price history travels through snapshots as pandas split-orient JSON
+(``{"columns": [...], "index": [...], "data": [[...], ...]}``). Agents only need
+the numeric OHLCV matrix, so these helpers decode it straight into a float64
+ndarray and skip DataFrame construction; ``split_payload_to_frame`` rebuilds the
+DataFrame for the data layer without going through ``pd.read_json``.
+
+The price cache stores frames as Feather (Arrow IPC) bytes instead:
+``frame_to_feather`` / ``feather_to_frame`` round-trip OHLCV frames exactly
+(dtypes, timezone, MultiIndex columns) without decimal float encoding.
+Without pyarrow, ``frame_to_split_json`` writes the split layout with orjson
+and an epoch-nanosecond index, which avoids pandas' JSON/ISO formatter.
+"""
+from __future__ import annotations
+
+import json
+from io import StringIO
+from typing import Any, Dict, List, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    # Fallback: stdlib json (slower, same results)
+    orjson = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.feather as feather
+    FEATHER_AVAILABLE = True
+except ImportError:
+    # Fallback: callers keep caching frames as split-orient JSON
+    pa = None
+    feather = None
+    FEATHER_AVAILABLE = False
+
+# Leading bytes of every Feather v2 / Arrow IPC file
+FEATHER_MAGIC = b"ARROW1"
+
+# Stdlib encoders for the fallback paths, built once: json.dumps with any
+# non-default option constructs a new JSONEncoder per call. encode() keeps no
+# state between calls, so both are safe to share across threads
+_COMPACT_ENCODER = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"))
+_INDENT_ENCODER = json.JSONEncoder(ensure_ascii=False, indent=2)
+
+
+def json_loads(data: Union[str, bytes]) -> Any:
+    """Decode JSON with orjson when available, otherwise the stdlib parser."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(value: Any, indent: bool = False) -> str:
+    """
+    Encode JSON with orjson when available, otherwise the stdlib encoder.
+
+    Compact by default; ``indent=True`` pretty-prints with two spaces. NumPy
+    scalars and arrays are encoded natively; values orjson rejects
+    (non-string keys, integers beyond 64 bits, ...) go through the stdlib.
+    """
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(value, option=option).decode()
+        except TypeError:
+            pass
+    return (_INDENT_ENCODER if indent else _COMPACT_ENCODER).encode(value)
+
+
+def json_dumps_bytes(value: Any, indent: bool = False) -> bytes:
+    """``json_dumps`` as UTF-8 bytes, for writing straight to a file or socket."""
+    if orjson is not None:
+        option = orjson.OPT_SERIALIZE_NUMPY | (orjson.OPT_INDENT_2 if indent else 0)
+        try:
+            return orjson.dumps(value, option=option)
+        except TypeError:
+            pass
+    return (_INDENT_ENCODER if indent else _COMPACT_ENCODER).encode(value).encode("utf-8")
+
+
+def parse_split_prices(payload: Union[str, bytes]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Parse a split-orient price payload into ``(data, columns)``.
+
+    Args:
+        payload: JSON produced by ``DataFrame.to_json(orient="split")``
+
+    Returns:
+        Tuple of a 2-D float64 array (rows x columns, missing values as NaN) and
+        the column names. MultiIndex columns such as ``["Close", "RELIANCE.NS"]``
+        (yfinance per-ticker layout) are reduced to their first level. The array
+        is column-major, so ``data[:, j]`` is a contiguous view (no copy needed
+        before handing a column to a compiled kernel).
+    """
+    obj = json_loads(payload)
+    columns = [c[0] if isinstance(c, list) else c for c in obj["columns"]]
+    data = np.asarray(obj["data"], dtype=np.float64).reshape(len(obj["index"]), len(columns))
+    return np.asfortranarray(data), columns
+
+
+def split_payload_to_frame(payload: Union[str, bytes, Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Decode a split-orient OHLCV payload into a DataFrame.
+
+    Matches ``pd.read_json(StringIO(payload), orient="split")`` for price frames:
+    ISO index strings become a DatetimeIndex, list column labels become tuples,
+    and float columns holding only whole numbers are coerced to int64.
+    Payloads from ``frame_to_split_json`` carry an epoch-nanosecond index and
+    a ``"tz"`` field. Other payloads with non-numeric data or a non-ISO index
+    fall back to ``pd.read_json``. An already-decoded payload dict is accepted.
+    """
+    obj = payload if isinstance(payload, dict) else json_loads(payload)
+    columns = [tuple(c) if isinstance(c, list) else c for c in obj["columns"]]
+    try:
+        data = np.asarray(obj["data"], dtype=np.float64).reshape(len(obj["index"]), len(columns))
+        if "tz" in obj:
+            # Written by frame_to_split_json: epoch nanoseconds plus the timezone
+            index = pd.DatetimeIndex(np.asarray(obj["index"], dtype=np.int64).view("datetime64[ns]"))
+            if obj["tz"]:
+                index = index.tz_localize("UTC").tz_convert(obj["tz"])
+        elif not all(isinstance(ts, str) for ts in obj["index"]):
+            raise TypeError("non-ISO index")
+        else:
+            index = pd.to_datetime(obj["index"], format="ISO8601")
+    except (TypeError, ValueError):
+        if isinstance(payload, dict):
+            payload = json_dumps(payload)
+        elif isinstance(payload, bytes):
+            payload = payload.decode("utf-8")
+        return pd.read_json(StringIO(payload), orient="split")
+
+    frame = {}
+    with np.errstate(invalid="ignore"):
+        for j in range(len(columns)):
+            col = data[:, j]
+            as_int = col.astype(np.int64)
+            frame[j] = as_int if np.array_equal(as_int, col) else col
+    df = pd.DataFrame(frame, index=index)
+    df.columns = pd.Index(columns, tupleize_cols=False)
+    return df
+
+
+def get_or_parse_prices(block: Dict[str, Any]) -> Tuple[np.ndarray, List[str]]:
+    """
+    Return ``parse_split_prices(block["data"])``, parsing each payload at most once.
+
+    The result is memoized on the payload dict itself under ``"_parsed"`` (the
+    block is mutated), so every consumer of the same snapshot shares one parse.
+    The memo is tied to the identity of ``block["data"]`` and is refreshed if the
+    payload is replaced. The shared array is marked read-only.
+    """
+    raw = block["data"]
+    cached = block.get("_parsed")
+    if cached is not None and cached[0] is raw:
+        return cached[1]
+    data, columns = parse_split_prices(raw)
+    data.setflags(write=False)
+    block["_parsed"] = (raw, (data, columns))
+    return data, columns
+
+
+def frame_to_split_json(df: pd.DataFrame) -> str:
+    """
+    Encode a DataFrame as split-orient JSON readable by ``split_payload_to_frame``.
+
+    Numeric frames with a DatetimeIndex are written with full float precision, the
+    index as epoch nanoseconds and a ``"tz"`` field, roughly 30x faster than
+    ``DataFrame.to_json``. Anything else goes through ``to_json(orient="split")``.
+    """
+    index = df.index
+    if not isinstance(index, pd.DatetimeIndex) or not all(dt.kind in "biuf" for dt in df.dtypes):
+        return df.to_json(orient="split", date_format="iso")
+    data = np.ascontiguousarray(df.to_numpy(dtype=np.float64))  # orjson needs C order
+    stamps = index.as_unit("ns").asi8
+    if orjson is None:
+        # The stdlib encoder needs lists and would write NaN as a bare token
+        data = np.where(np.isnan(data), None, data).tolist()
+        stamps = stamps.tolist()
+    return json_dumps({
+        "columns": [list(c) if isinstance(c, tuple) else c for c in df.columns],
+        "index": stamps,
+        "data": data,
+        "tz": str(index.tz) if index.tz is not None else "",
+    })
+
+
+def frame_to_feather(df: pd.DataFrame) -> bytes:
+    """
+    Serialize a DataFrame to lz4-compressed Feather bytes (requires pyarrow).
+
+    Numeric frames with a DatetimeIndex are written as plain Arrow columns plus
+    a few metadata fields, which ``feather_to_frame`` rebuilds without pandas'
+    generic (and much slower) metadata reconstruction. Anything else is
+    written with ``feather.write_feather`` and read back through pyarrow.
+    """
+    sink = pa.BufferOutputStream()
+    index = df.index
+    if isinstance(index, pd.DatetimeIndex) and all(dt.kind in "biuf" for dt in df.dtypes):
+        labels = [list(c) if isinstance(c, tuple) else c for c in df.columns]
+        arrays = [pa.array(index.as_unit("ns").asi8)]
+        arrays += [pa.array(df.iloc[:, j].to_numpy()) for j in range(df.shape[1])]
+        table = pa.Table.from_arrays(arrays, names=[str(j) for j in range(len(arrays))])
+        table = table.replace_schema_metadata({
+            "columns": json_dumps(labels),
+            "column_names": json_dumps(list(df.columns.names)),
+            "index_name": json_dumps(index.name),
+            "tz": str(index.tz) if index.tz is not None else "",
+        })
+        feather.write_feather(table, sink, compression="lz4")
+    else:
+        feather.write_feather(df, sink, compression="lz4")
+    return sink.getvalue().to_pybytes()
+
+
+def feather_to_frame(data: bytes) -> pd.DataFrame:
+    """Decode bytes written by ``frame_to_feather`` (or any Feather v2 file)."""
+    table = feather.read_table(pa.BufferReader(data))
+    meta = table.schema.metadata or {}
+    if b"columns" not in meta:
+        return table.to_pandas()
+
+    labels = json_loads(meta[b"columns"])
+    names = json_loads(meta[b"column_names"])
+    index = pd.DatetimeIndex(
+        table.column(0).to_numpy().view("datetime64[ns]"), name=json_loads(meta[b"index_name"])
+    )
+    if meta[b"tz"]:
+        index = index.tz_localize("UTC").tz_convert(meta[b"tz"].decode())
+    df = pd.DataFrame({j: table.column(j + 1).to_numpy() for j in range(len(labels))}, index=index)
+    if any(isinstance(c, list) for c in labels):
+        df.columns = pd.MultiIndex.from_tuples([tuple(c) for c in labels], names=names)
+    else:
+        df.columns = pd.Index(labels, name=names[0])
+    return df